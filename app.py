@@ -6,15 +6,15 @@ and listing details from eBay listings.
 """
 
 import sys
-import io
 
 # Set UTF-8 encoding for stdout/stderr to handle Unicode characters
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace', line_buffering=True)
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace', line_buffering=True)
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace', line_buffering=True)
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace', line_buffering=True)
 
-from flask import Flask, jsonify, request, Response, stream_with_context
-from flask_cors import CORS
+from flask import Flask, request, Response, stream_with_context
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 from werkzeug.serving import WSGIRequestHandler
 from backend.copyScripts.CopyListingMain import copy_listing_main, testing_function
 from backend.copyScripts.create_image import (
@@ -23,46 +23,307 @@ from backend.copyScripts.create_image import (
     categorize_images,
     _openrouter_response_dict_to_image_bytes_and_mime,
 )
-from backend.copyScripts.combine_data import get_next_sku, create_listing_with_preferences, update_listing_images, update_listing_title_description, update_listing_meta_data, load_listing_data, update_listing_with_aspects, compute_aspects_for_category, save_ebay_listing_id, update_listing_models, get_auto_restock_settings, save_auto_restock_settings, update_local_listing_quantity, extract_metadata_for_llm, resolve_listing_json_path
-from backend.helper_functions import remove_html_tags
+from backend.copyScripts.combine_data import get_next_sku, create_listing_with_preferences, update_listing_images, update_listing_title_description, load_listing_data, compute_aspects_for_category, save_ebay_listing_id, edit_listing, apply_listing_models, apply_listing_images, apply_listing_title_description, apply_listing_meta_data, apply_listing_aspects, write_listing_file, get_auto_restock_settings, save_auto_restock_settings, update_local_listing_quantity, extract_metadata_for_llm, resolve_listing_json_path, listing_file_exists, GENERATED_LISTINGS_DIR
+from backend.copyScripts.listing_index import iter_listing_summaries_json
+from backend.copyScripts.image_cache import image_cache_enabled, image_cache_key, get_cached_images, store_cached_images
+from backend.helper_functions import remove_html_tags, TTLCache, SingleFlight, RedisCache, TokenBucket, TaskStore, RedisTaskStore, http_session
 import os
 import json
-import time
+import base64
+import xml.etree.ElementTree as ET
+import logging
+import logging.handlers
+import queue
+import re
+import traceback
 import uuid
+import functools
+import atexit
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 from backend.copyScripts.create_text import create_text, create_text_stream
-from backend.ebay_cli import call_text_llm
+from backend.ebay_cli import call_text_llm, single_get_detailed_item_data
 from backend.copyScripts.imageEditing import remove_background, compile_images
+from backend.text_models import get_available_text_models, is_bedrock_model, is_openrouter_model
 from backend.copyScripts.upload_to_ebay import upload_complete_listing
 import requests
+import orjson
+from decimal import Decimal
 from dotenv import load_dotenv
 
-app = Flask(__name__)
-# Enable CORS for all routes to allow React frontend to make requests
-CORS(app, origins=["http://localhost:3000", "http://localhost:5173", "http://localhost:5174"])
 
-# In-memory storage for image generation task progress
-# Structure: {task_id: {"status": "running|completed|failed", "total": N, "completed": M, "results": [], "errors": []}}
-image_generation_tasks = {}
-image_generation_lock = threading.Lock()
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+
+def _orjson_default(obj):
+    """Fallback for types orjson does not serialize natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """Route Flask's JSON handling (request.get_json(), any jsonify()) through orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS, default=_orjson_default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Request threads only enqueue log records; a listener thread does the formatting
+# and the (locked, synchronous) stream write
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # layout is applied by the listener's handler
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    handlers=[_log_queue_handler],
+)
+log = logging.getLogger('axis.api')
+
+
+app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Compress plain JSON responses (listing/photo URL arrays shrink well). NDJSON streams are
+# left alone so progress events reach the frontend as soon as they're yielded.
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_BR_LEVEL'] = 4
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+# CORS for the React dev frontends: a set lookup per response instead of flask-cors' origin matching
+_CORS_ALLOWED_ORIGINS = frozenset({"http://localhost:3000", "http://localhost:5173", "http://localhost:5174"})
+_CORS_ALLOWED_METHODS = "GET, HEAD, POST, PUT, PATCH, DELETE, OPTIONS"
+
+
+@app.after_request
+def _apply_cors_headers(resp):
+    origin = request.headers.get('Origin')
+    if origin in _CORS_ALLOWED_ORIGINS:
+        resp.headers['Access-Control-Allow-Origin'] = origin
+        resp.headers.add('Vary', 'Origin')
+        if request.method == 'OPTIONS':
+            # Preflight: Flask answers OPTIONS automatically; add what the browser asked to send
+            resp.headers['Access-Control-Allow-Methods'] = _CORS_ALLOWED_METHODS
+            requested_headers = request.headers.get('Access-Control-Request-Headers')
+            if requested_headers:
+                resp.headers['Access-Control-Allow-Headers'] = requested_headers
+    return resp
+
+# Image generation task progress: {"status": "running|completed|failed", "total": N, "completed": M, "results": [], "errors": []}
+# Kept in Redis when REDIS_URL is set so status polls work across worker processes
+image_generation_tasks = RedisTaskStore(os.environ['REDIS_URL'], prefix="imagegen:task:") if os.getenv('REDIS_URL') else TaskStore()
+
+# Project root (where .env lives), resolved once rather than per request
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ENV_PATH = os.path.join(BASE_DIR, '.env')
 
 DEFAULT_TEXT_MODEL = "deepseek/deepseek-v4-flash"
 DEFAULT_IMAGE_MODEL = "sourceful/riverflow-v2-fast"
 DEFAULT_CLASSIFIER_MODEL = "bytedance-seed/seed-1.6-flash"
 
+# Worker threads shared by every /api/generate-images and /api/regenerate-images request
+IMAGE_GEN_WORKERS = int(os.getenv("IMAGE_GEN_WORKERS", "8"))
+IMAGE_GEN_POOL = ThreadPoolExecutor(max_workers=IMAGE_GEN_WORKERS, thread_name_prefix="imagegen")
+atexit.register(IMAGE_GEN_POOL.shutdown, wait=False)
+# Held across each upstream generation call; also bounds any caller outside IMAGE_GEN_POOL
+image_gen_slots = threading.BoundedSemaphore(IMAGE_GEN_WORKERS)
+# Upstream image-generation calls: sustained 2/s (the old 500ms stagger), bursts of 5
+image_gen_rate_limiter = TokenBucket(rate=2, capacity=5)
+
+# Photo categories that are used as-is rather than regenerated
+SKIP_CATEGORIES = frozenset({'real_world_image', 'edited_image'})
+# Which generation prompt to use for each remaining category
+CATEGORY_TO_IMAGE_TYPE = {
+    'bad_image': ImageType.REAL_WORLD,
+    'professional_image': ImageType.PROFESSIONAL,
+}
+
+# eBay item data keyed by bare item id; photos rarely change, so repeat lookups skip the Browse API
+listing_cache = TTLCache(maxsize=1024, ttl=300)
+# Optional second tier shared across processes/workers, enabled by REDIS_URL
+shared_listing_cache = RedisCache(os.environ['REDIS_URL'], prefix="ebay:listing:", ttl=600) if os.getenv('REDIS_URL') else None
+# Concurrent requests for the same uncached listing share one eBay fetch
+listing_flight = SingleFlight()
+# Background warm-up of listings the frontend hints it will open next (?prefetch=id1,id2)
+_listing_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="listing-prefetch")
+MAX_PREFETCH_IDS = 10
+# Taxonomy aspect lookups started by /api/photos, overlapped with SKU creation and categorizing
+_aspects_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aspects-prefetch")
+
+
+# Item id inside an eBay URL (/itm/<id> or /itm/<slug>/<id>) or a RESTful "v1|<id>|<variation>" id
+_ITEM_ID_IN_URL_RE = re.compile(r'(?:/itm/(?:[^/?#]+/)?|^v1\|)(\d{9,15})(?=[/?#|]|$)')
+_BARE_ITEM_ID_RE = re.compile(r'\d{9,15}')
+
+
+def _parse_item_id(listing_id):
+    """
+    Normalize an eBay listing URL or bare id to the numeric item id used as the cache key,
+    so a URL and its bare id share one cache slot. Returns None if no item id is present.
+    """
+    if not listing_id:
+        return None
+    listing_id = listing_id.strip()
+    if _BARE_ITEM_ID_RE.fullmatch(listing_id):
+        return listing_id
+    match = _ITEM_ID_IN_URL_RE.search(listing_id)
+    return match.group(1) if match else None
+
+
+def _fetch_and_cache_listing(item_id):
+    """Fetch an item from the Browse API and store it in listing_cache on success."""
+    try:
+        listing = single_get_detailed_item_data(item_id, verbose=True)
+    except Exception as e:
+        log.warning("eBay fetch failed for %s: %s", item_id, e)
+        return None
+    if listing:
+        listing_cache.set(item_id, listing)
+        if shared_listing_cache:
+            shared_listing_cache.set(item_id, listing)
+    return listing
+
+
+def get_cached_listing(item_id, refresh=False):
+    """
+    Return eBay item data for item_id: fresh from cache, else fetched (single-flight),
+    else a stale cached copy if the fetch failed. None if nothing is available.
+    refresh=True skips the fresh-cache lookups and always refetches (and re-caches).
+    """
+    if not refresh:
+        listing = listing_cache.get(item_id)
+        if listing is not None:
+            return listing
+        if shared_listing_cache:
+            listing = shared_listing_cache.get(item_id)
+            if listing is not None:
+                listing_cache.set(item_id, listing)
+                return listing
+    listing = listing_flight.do(item_id, lambda: _fetch_and_cache_listing(item_id), timeout=60)
+    if not listing:
+        # Fall back to a stale copy rather than failing outright
+        listing = listing_cache.get(item_id, allow_stale=True)
+        if listing:
+            log.info("Serving stale cached listing for %s", item_id)
+    return listing
+
+
+def _prefetch_listings(raw_ids):
+    """Queue background cache fills for a comma-separated list of listing ids/URLs."""
+    for raw_id in raw_ids.split(',')[:MAX_PREFETCH_IDS]:
+        item_id = _parse_item_id(raw_id)
+        if item_id and item_id not in listing_cache:
+            _listing_prefetch_pool.submit(get_cached_listing, item_id)
+
+def _json(payload, status=200):
+    """Build a JSON Response straight from orjson bytes, skipping jsonify's str round trip."""
+    return Response(orjson.dumps(payload, option=_ORJSON_OPTIONS, default=_orjson_default), status=status, mimetype='application/json')
+
+def _not_modified(etag, cache_control='no-cache'):
+    """304 response for a client whose If-None-Match already matches etag."""
+    resp = Response(status=304)
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = cache_control
+    return resp
+
+def api_error_handler(message=None, **empty_fields):
+    """
+    Turn an uncaught exception in a JSON route into a logged 500 response.
+
+    Args:
+        message: Prefix for the error text ("<message>: <exception>"); the bare
+            exception text is used when omitted.
+        **empty_fields: Extra keys the frontend expects in the error payload,
+            e.g. listing_data=None.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                log.exception("Unhandled error in %s", fn.__name__)
+                error = f"{message}: {e}" if message else str(e)
+                return _json({"error": error, **empty_fields}, status=500)
+        return wrapper
+    return decorator
+
+# Largest JSON request body accepted by json_body routes (413 above this)
+MAX_JSON_BODY_BYTES = 1 << 20
+
+def json_body(max_bytes=MAX_JSON_BODY_BYTES, required_keys=(), stream=False, allow_empty=False,
+              **empty_fields):
+    """
+    Parse the request's JSON object body with orjson and pass it to the route as `data`.
+
+    Oversize bodies are refused with 413 before they are parsed (from Content-Length
+    when the client sends one); malformed JSON, a non-object body, or a missing
+    required key gets a 400. None of these reach the route.
+
+    Args:
+        max_bytes: Body size limit.
+        required_keys: Top-level keys that must be present.
+        stream: Send rejections as a single NDJSON error event, for routes whose
+            frontend reads the response with the streaming progress reader.
+        allow_empty: Treat an empty or `null` body as `{}` instead of rejecting it, for
+            routes whose callers may POST without a payload.
+        **empty_fields: Extra keys the frontend expects in a JSON error payload.
+    """
+    def reject(error, status):
+        if stream:
+            return Response(error_event(error), status=status, mimetype='application/x-ndjson')
+        return _json({"error": error, **empty_fields}, status=status)
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            too_large = f"Request body exceeds {max_bytes} bytes"
+            if request.content_length is not None and request.content_length > max_bytes:
+                return reject(too_large, 413)
+            raw = request.get_data(cache=False)
+            if len(raw) > max_bytes:
+                return reject(too_large, 413)
+            try:
+                data = orjson.loads(raw) if raw.strip() or not allow_empty else None
+            except orjson.JSONDecodeError:
+                return reject("Request body must be JSON", 400)
+            if data is None and allow_empty:
+                data = {}
+            if not isinstance(data, dict):
+                return reject("Request body must be a JSON object", 400)
+            missing = [key for key in required_keys if key not in data]
+            if missing:
+                return reject(f"{missing[0]} is required in request body", 400)
+            return fn(*args, data=data, **kwargs)
+        return wrapper
+    return decorator
+
 # --- Streaming progress helpers (NDJSON) ---
+def ndjson_line(event):
+    """Encode one event as an NDJSON line, as bytes so Werkzeug writes it without re-encoding."""
+    return orjson.dumps(event, option=_ORJSON_OPTIONS, default=_orjson_default) + b"\n"
+
 def progress_event(step, status):
     """Send a progress event as an NDJSON line."""
-    return json.dumps({"type": "progress", "step": step, "status": status}) + "\n"
+    return ndjson_line({"type": "progress", "step": step, "status": status})
 
 def result_event(data):
     """Send a final result event as an NDJSON line."""
-    return json.dumps({"type": "result", "data": data}) + "\n"
+    return ndjson_line({"type": "result", "data": data})
 
 def error_event(error_msg):
     """Send an error event as an NDJSON line."""
-    return json.dumps({"type": "error", "error": error_msg}) + "\n"
+    return ndjson_line({"type": "error", "error": error_msg})
 
 def streaming_response(generator):
     """Wrap a generator in a streaming Flask Response with proper headers."""
@@ -106,22 +367,22 @@ def generate_text():
             for event in create_text_stream(title, description, model=text_model):
                 if event.get("type") == "result":
                     final_result = event.get("data", {})
-                yield json.dumps(event) + "\n"
+                yield ndjson_line(event)
 
             # After streaming completes, nudge title length into [75, 80] if needed
             if final_result and final_result.get("edited_title"):
                 pending_title = final_result["edited_title"]
                 title_len = len(pending_title)
                 if not (TITLE_MIN_LEN <= title_len <= TITLE_MAX_LEN):
-                    yield json.dumps({"type": "nudging", "message": "Adjusting title length..."}) + "\n"
+                    yield ndjson_line({"type": "nudging", "message": "Adjusting title length..."})
                     nudged_title, _ = _nudge_title_length(pending_title, text_model)
                     if nudged_title:
                         # Stream the nudged title char-by-char so the frontend can animate it
                         for char in nudged_title:
-                            yield json.dumps({"type": "token", "field": "title", "delta": char}) + "\n"
+                            yield ndjson_line({"type": "token", "field": "title", "delta": char})
                         nudged_result = dict(final_result)
                         nudged_result["edited_title"] = nudged_title
-                        yield json.dumps({"type": "result", "data": nudged_result}) + "\n"
+                        yield ndjson_line({"type": "result", "data": nudged_result})
         except Exception as e:
             yield error_event(f"Text generation failed: {e}")
 
@@ -133,18 +394,26 @@ def get_listing_photos(listing_id):
     Fetch photos and listing details for a given eBay listing ID or URL.
     Streams real-time progress events as NDJSON so the frontend can show accurate status.
     """
-    def generate():
-        try:
-            from backend.ebay_cli import single_get_detailed_item_data
+    # Parse ID from URL if needed; reject junk before any eBay/SKU work happens
+    item_id = _parse_item_id(listing_id)
+    if item_id is None:
+        return Response(
+            error_event(f"Invalid eBay listing ID or URL: {listing_id}"),
+            status=400,
+            mimetype='application/x-ndjson',
+        )
 
-            # Parse ID from URL if needed
-            item_id = listing_id
-            if item_id and (item_id[0] == 'h' or item_id[0] == 'e'):
-                item_id = item_id.split('/itm/')[1].split('?')[0]
+    prefetch_ids = request.args.get('prefetch')
+    if prefetch_ids:
+        _prefetch_listings(prefetch_ids)
+    # ?nocache=1 forces a fresh eBay fetch, e.g. after the seller edited the listing
+    refresh = request.args.get('nocache') == '1'
 
-            # Step 1: Fetch listing from eBay
+    def generate():
+        try:
+            # Step 1: Fetch listing from eBay (served from cache when fresh)
             yield progress_event('Fetching listing from eBay', 'in_progress')
-            listing = single_get_detailed_item_data(item_id, verbose=True)
+            listing = get_cached_listing(item_id, refresh=refresh)
 
             if not listing:
                 yield error_event("Failed to fetch listing data. The listing may not exist or the ID is invalid.")
@@ -152,19 +421,29 @@ def get_listing_photos(listing_id):
 
             yield progress_event('Fetching listing from eBay', 'completed')
 
+            # Pre-fetch aspects for the listing's category so create-listing can skip the Taxonomy API;
+            # it only needs the listing, so it runs while the SKU is created and images are categorized
+            category_id = listing.get('categoryId', 'N/A')
+            localized_aspects = listing.get('localizedAspects', [])
+            aspects_future = None
+            if category_id and category_id != 'N/A':
+                aspects_future = _aspects_prefetch_pool.submit(compute_aspects_for_category, category_id, localized_aspects)
+
             # Step 2: Create initial JSON file
             yield progress_event('Creating initial JSON file', 'in_progress')
             new_sku = create_listing_with_preferences()
             yield progress_event('Creating initial JSON file', 'completed')
 
             # Extract photo URLs
+            additional_images = listing.get("additionalImages") or ()
             old_photo_list = [
-                url for url in
-                [listing.get("image", {}).get("imageUrl")] +
-                [img.get("imageUrl") for img in listing.get("additionalImages", []) if isinstance(img, dict)]
+                url for url in chain(
+                    ((listing.get("image") or {}).get("imageUrl"),),
+                    (img.get("imageUrl") for img in additional_images if isinstance(img, dict)),
+                )
                 if url
             ]
-            print(f"Found {len(old_photo_list)} photo(s): {old_photo_list}")
+            log.info("Found %s photo(s): %s", len(old_photo_list), old_photo_list)
 
             classify = request.args.get("classify", "true").lower() != "false"
 
@@ -174,23 +453,20 @@ def get_listing_photos(listing_id):
                 classifier_model = request.args.get("classifier_model") or DEFAULT_CLASSIFIER_MODEL
                 yield progress_event('Categorizing images', 'in_progress')
                 if old_photo_list:
-                    print("Categorizing images...")
+                    log.info("Categorizing images...")
                     categories = categorize_images(old_photo_list, model=classifier_model)
                     if categories is None:
                         categories = {}
                 yield progress_event('Categorizing images', 'completed')
             else:
-                print("Skipping image categorization (classify=false)")
+                log.info("Skipping image categorization (classify=false)")
 
-            # Pre-fetch aspects for the listing's category so create-listing can skip the Taxonomy API
-            category_id = listing.get('categoryId', 'N/A')
-            localized_aspects = listing.get('localizedAspects', [])
             pre_fetched_aspects = None
-            if category_id and category_id != 'N/A':
+            if aspects_future is not None:
                 try:
-                    pre_fetched_aspects = compute_aspects_for_category(category_id, localized_aspects)
+                    pre_fetched_aspects = aspects_future.result()
                 except Exception as _e:
-                    print(f"[API] Warning: aspect pre-fetch failed ({_e}), will retry in create-listing")
+                    log.warning("aspect pre-fetch failed (%s), will retry in create-listing", _e)
 
             # Send final result
             result = {
@@ -214,15 +490,40 @@ def get_listing_photos(listing_id):
             yield result_event(result)
 
         except Exception as e:
-            try:
-                error_msg = str(e)
-            except UnicodeEncodeError:
-                error_msg = "An error occurred while fetching listing data (encoding error)"
-            yield error_event(f"An error occurred while fetching listing data: {error_msg}")
+            yield error_event(f"An error occurred while fetching listing data: {e}")
 
     return streaming_response(generate())
 
+@app.route('/api/cache/invalidate/<path:listing_id>', methods=['POST'])
+def invalidate_listing_cache(listing_id):
+    """Drop a cached eBay listing so the next /api/photos call refetches it."""
+    item_id = _parse_item_id(listing_id)
+    if item_id is None:
+        return _json({"error": f"Invalid eBay listing ID or URL: {listing_id}", "invalidated": False}, status=400)
+
+    was_cached = listing_cache.pop(item_id) is not None
+    if shared_listing_cache:
+        shared_listing_cache.delete(item_id)
+    log.info("Invalidated cached listing %s (was cached: %s)", item_id, was_cached)
+    return _json({"item_id": item_id, "invalidated": was_cached, "error": None})
+
+def _generation_status_payload(task):
+    """Status body shared by the polled and streamed generation-status endpoints."""
+    response_data = {
+        "status": task["status"],
+        "total": task["total"],
+        "completed": task["completed"],
+        "errors": task["errors"]
+    }
+    
+    # Include results once finished (partial results if it failed)
+    if task["status"] in ("completed", "failed"):
+        response_data["generated_images"] = task["results"]
+    
+    return response_data
+
 @app.route('/api/generate-images-status/<task_id>', methods=['GET'])
+@api_error_handler("An error occurred while checking status", status=None)
 def get_generation_status(task_id):
     """
     Get status of image generation task.
@@ -230,54 +531,86 @@ def get_generation_status(task_id):
     Returns:
         JSON response with task status, progress, and results if completed
     """
-    try:
-        with image_generation_lock:
-            if task_id not in image_generation_tasks:
-                return jsonify({
-                    "error": f"Task {task_id} not found",
-                    "status": None
-                }), 404
-            
-            task = image_generation_tasks[task_id]
-            
-            response_data = {
-                "status": task["status"],
-                "total": task["total"],
-                "completed": task["completed"],
-                "errors": task["errors"]
-            }
-            
-            # Include results if completed
-            if task["status"] == "completed":
-                response_data["generated_images"] = task["results"]
-            elif task["status"] == "failed":
-                response_data["generated_images"] = task["results"]  # Return partial results if any
-            
-            return jsonify(response_data), 200
-            
-    except Exception as e:
-        return jsonify({
-            "error": f"An error occurred while checking status: {str(e)}",
+    task = image_generation_tasks.get(task_id)
+    if task is None:
+        return _json({
+            "error": f"Task {task_id} not found",
+            "status": None
+        }, status=404)
+    
+    return _json(_generation_status_payload(task))
+
+# Seconds between keep-alive comments on an idle status stream
+STATUS_STREAM_HEARTBEAT = 15
+# Heartbeats in a row without a task change before a status stream is closed
+# (~10 minutes); EventSource reconnects if the task is in fact still running
+STATUS_STREAM_MAX_IDLE_HEARTBEATS = 40
+
+@app.route('/api/generate-images-stream/<task_id>', methods=['GET'])
+@api_error_handler("An error occurred while checking status", status=None)
+def stream_generation_status(task_id):
+    """
+    Server-Sent Events feed of an image generation task's status.
+    
+    Pushes the same payload as /api/generate-images-status whenever the task
+    changes, and closes the stream once it is completed or failed, or after
+    STATUS_STREAM_MAX_IDLE_HEARTBEATS heartbeats with no change. A task that
+    disappears (e.g. expired) ends the stream with a "gone" event so the
+    client stops reconnecting.
+    
+    Returns:
+        text/event-stream response, or 404 JSON if the task is unknown
+    """
+    if image_generation_tasks.get(task_id) is None:
+        return _json({
+            "error": f"Task {task_id} not found",
             "status": None
-        }), 500
+        }, status=404)
+
+    def generate():
+        last_sent = None
+        idle_heartbeats = 0
+        while idle_heartbeats < STATUS_STREAM_MAX_IDLE_HEARTBEATS:
+            task = image_generation_tasks.get(task_id)
+            if task is None:
+                yield b"event: gone\ndata: " + orjson.dumps({"error": f"Task {task_id} not found"}) + b"\n\n"
+                return
+            payload = _generation_status_payload(task)
+            if payload != last_sent:
+                yield b"data: " + orjson.dumps(payload) + b"\n\n"
+                last_sent = payload
+            if task["status"] != "running":
+                return
+            if image_generation_tasks.wait_for_update(task_id, task["version"], STATUS_STREAM_HEARTBEAT):
+                idle_heartbeats = 0
+            else:
+                idle_heartbeats += 1
+                yield b": keep-alive\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
 
-def generate_image_with_delay(
+def generate_image_rate_limited(
     photo_url,
     image_type,
     index,
-    delay_ms=500,
     task_id=None,
     prompt_modifier=None,
     image_model=None,
 ):
     """
-    Generate image with rate limiting delay. Used for parallel execution.
+    Generate one image, rate limited by image_gen_rate_limiter. Used for parallel execution.
     
     Args:
         photo_url: URL of photo to generate from
         image_type: ImageType enum value
-        index: Index of this image (for ordering and delay calculation)
-        delay_ms: Delay in milliseconds before starting generation
+        index: Index of this image (for ordering and logging)
         task_id: Task ID for progress tracking
         prompt_modifier: Optional additional text to append to each image's prompt
     
@@ -285,56 +618,60 @@ def generate_image_with_delay(
         tuple: (index, photo_url, result, error)
     """
     try:
-        # Stagger API calls to avoid rate limits
-        time.sleep(index * delay_ms / 1000)
-        
-        # Update progress: starting
-        if task_id:
-            with image_generation_lock:
-                if task_id in image_generation_tasks:
-                    image_generation_tasks[task_id]["status"] = "running"
-        
-        print(f"[API] Starting generation for image {index + 1} (photo: {photo_url[:50]}...)")
-        
-        # Generate image
-        result = generate_image_from_urls(
-            [photo_url],
-            image_type,
-            prompt_modifier=prompt_modifier,
-            model=image_model or DEFAULT_IMAGE_MODEL,
-        )
+        log.info("Starting generation for image %s (photo: %s...)", index + 1, photo_url[:50])
+        
+        # Reuse a previous generation for the same source/type/prompt/model when available
+        model = image_model or DEFAULT_IMAGE_MODEL
+        cache_key = image_cache_key(photo_url, image_type, prompt_modifier, model) if image_cache_enabled() else None
+        result = get_cached_images(cache_key) if cache_key else None
+        if result:
+            log.info("Reusing cached generation for image %s", index + 1)
+        else:
+            # Wait for a token only when actually calling upstream (cache hits are free)
+            image_gen_rate_limiter.acquire()
+            with image_gen_slots:
+                result = generate_image_from_urls(
+                    [photo_url],
+                    image_type,
+                    prompt_modifier=prompt_modifier,
+                    model=model,
+                )
+            if result and cache_key:
+                store_cached_images(cache_key, result)
         
         # Update progress: completed
         if task_id:
-            with image_generation_lock:
-                if task_id in image_generation_tasks:
-                    if result:
-                        image_generation_tasks[task_id]["completed"] += 1
-                        if isinstance(result, list):
-                            image_generation_tasks[task_id]["results"].extend(result)
-                        else:
-                            image_generation_tasks[task_id]["results"].append(result)
-                    else:
-                        image_generation_tasks[task_id]["errors"].append(f"Failed to generate image for {photo_url[:50]}...")
+            if result:
+                image_generation_tasks.record_item(task_id, results=result if isinstance(result, list) else [result])
+            else:
+                image_generation_tasks.record_item(task_id, error=f"Failed to generate image for {photo_url[:50]}...", completed=False)
         
         return (index, photo_url, result, None)
     except Exception as e:
         error_msg = f"Error generating image for {photo_url[:50]}...: {str(e)}"
-        print(f"[API] Exception: {error_msg}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception: %s", error_msg)
         
         # Update progress: error
         if task_id:
-            with image_generation_lock:
-                if task_id in image_generation_tasks:
-                    image_generation_tasks[task_id]["errors"].append(error_msg)
-                    image_generation_tasks[task_id]["completed"] += 1
+            image_generation_tasks.record_item(task_id, error=error_msg)
         
         return (index, photo_url, None, error_msg)
 
+def _finish_generation_task(task_id):
+    """Mark a generation task completed or failed based on whether any images succeeded."""
+    t = image_generation_tasks.get(task_id) or {}
+    image_generation_tasks.set_status(task_id, "completed" if t.get("results") else "failed")
+    log.info(
+        "Task %s finished: %s images generated, %s errors",
+        task_id,
+        len(t.get('results', [])),
+        len(t.get('errors', [])),
+    )
+
 @app.route('/api/generate-images', methods=['POST'])
-def generate_images():
+@api_error_handler("An error occurred while generating images", task_id=None)
+@json_body(required_keys=("photos", "categories"), task_id=None)
+def generate_images(data):
     """
     Generate images based on confirmed categories using parallel async processing.
     
@@ -347,163 +684,101 @@ def generate_images():
     Returns:
         JSON response with task_id for progress tracking, or error message
     """
-    try:
-        print("[API] /api/generate-images endpoint called")
-        data = request.get_json()
-        print(f"[API] Received data: photos={len(data.get('photos', [])) if data else 0}, categories={len(data.get('categories', {})) if data else 0}")
-        
-        if not data:
-            print("[API] Error: No data in request")
-            return jsonify({
-                "error": "Request body must be JSON",
-                "task_id": None
-            }), 400
-        
-        photos = data.get("photos", [])
-        categories = data.get("categories", {})
-        prompt_modifier = data.get("prompt_modifier", "")
-        image_model = data.get("image_model") or DEFAULT_IMAGE_MODEL
-        
-        print(f"[API] Processing {len(photos)} photos with {len(categories)} categories")
-        if prompt_modifier:
-            print(f"[API] Prompt modifier: {prompt_modifier}")
-        
-        if not photos or not isinstance(photos, list):
-            print("[API] Error: Invalid photos array")
-            return jsonify({
-                "error": "photos must be a non-empty array",
-                "task_id": None
-            }), 400
-        
-        if not categories or not isinstance(categories, dict):
-            print("[API] Error: Invalid categories dict")
-            return jsonify({
-                "error": "categories must be a non-empty dictionary",
-                "task_id": None
-            }), 400
-        
-        # Categories to skip
-        skip_categories = ['real_world_image', 'edited_image']
-        
-        # Map categories to ImageType
-        category_to_image_type = {
-            'bad_image': ImageType.REAL_WORLD,
-            'professional_image': ImageType.PROFESSIONAL
-        }
-        
-        # Prepare tasks for parallel execution
-        tasks_to_generate = []
-        for idx, photo_url in enumerate(photos):
-            category = categories.get(photo_url)
-            
-            # Skip if category is None or in skip list
-            if not category or category in skip_categories:
-                print(f"[API] Skipping photo {idx + 1}: category={category} (None or in skip list)")
-                continue
-            
-            # Get ImageType for this category
-            image_type = category_to_image_type.get(category)
-            
-            if not image_type:
-                print(f"[API] Unknown category '{category}' for photo {photo_url[:50]}...")
-                continue
-            
-            tasks_to_generate.append((idx, photo_url, image_type))
-        
-        if not tasks_to_generate:
-            return jsonify({
-                "error": "No photos to generate (all skipped or invalid categories)",
-                "task_id": None
-            }), 400
-        
-        # Create task ID for progress tracking
-        task_id = str(uuid.uuid4())
-        
-        # Initialize task progress
-        with image_generation_lock:
-            image_generation_tasks[task_id] = {
-                "status": "running",
-                "total": len(tasks_to_generate),
-                "completed": 0,
-                "results": [],
-                "errors": []
-            }
-        
-        print(f"[API] Created task {task_id} for {len(tasks_to_generate)} image(s)")
-        
-        # Start parallel generation in background thread
-        def run_generation():
-            try:
-                with ThreadPoolExecutor(max_workers=5) as executor:
-                    # Submit all tasks
-                    futures = {}
-                    for idx, photo_url, image_type in tasks_to_generate:
-                        future = executor.submit(
-                            generate_image_with_delay,
-                            photo_url, image_type, idx, delay_ms=500, task_id=task_id,
-                            prompt_modifier=prompt_modifier if prompt_modifier else None,
-                            image_model=image_model,
-                        )
-                        futures[future] = (idx, photo_url)
-                    
-                    # Wait for all to complete
-                    for future in as_completed(futures):
-                        idx, photo_url = futures[future]
-                        try:
-                            result = future.result()
-                            # Result already processed in generate_image_with_delay
-                        except Exception as e:
-                            print(f"[API] Future exception for image {idx + 1}: {e}")
-                
-                # Mark task completed or failed based on whether any images succeeded
-                with image_generation_lock:
-                    if task_id in image_generation_tasks:
-                        t = image_generation_tasks[task_id]
-                        if t["results"]:
-                            t["status"] = "completed"
-                        else:
-                            t["status"] = "failed"
-
-                with image_generation_lock:
-                    t = image_generation_tasks.get(task_id, {})
-                print(f"[API] Task {task_id} finished: {len(t.get('results', []))} images generated, {len(t.get('errors', []))} errors")
-            except Exception as e:
-                print(f"[API] Error in background generation thread: {e}")
-                import traceback
-                traceback.print_exc()
-                with image_generation_lock:
-                    if task_id in image_generation_tasks:
-                        image_generation_tasks[task_id]["status"] = "failed"
-                        image_generation_tasks[task_id]["errors"].append(str(e))
-        
-        # Start background thread
-        thread = threading.Thread(target=run_generation, daemon=True)
-        thread.start()
-        
-        # Return task ID immediately
-        return jsonify({
-            "task_id": task_id,
-            "total_images": len(tasks_to_generate),
-            "error": None
-        }), 200
+    log.debug("/api/generate-images endpoint called")
+    
+    photos = data.get("photos", [])
+    categories = data.get("categories", {})
+    prompt_modifier = data.get("prompt_modifier", "")
+    image_model = data.get("image_model") or DEFAULT_IMAGE_MODEL
+    
+    log.info("Processing %s photos with %s categories", len(photos), len(categories))
+    if prompt_modifier:
+        log.debug("Prompt modifier: %s", prompt_modifier)
+    
+    if not photos or not isinstance(photos, list):
+        log.warning("Invalid photos array")
+        return _json({
+            "error": "photos must be a non-empty array",
+            "task_id": None
+        }, status=400)
+    
+    if not categories or not isinstance(categories, dict):
+        log.warning("Invalid categories dict")
+        return _json({
+            "error": "categories must be a non-empty dictionary",
+            "task_id": None
+        }, status=400)
+    
+    # Prepare tasks for parallel execution
+    tasks_to_generate = []
+    # dict.fromkeys drops repeated URLs (e.g. a double-submitted photo) while keeping order
+    for idx, photo_url in enumerate(dict.fromkeys(photos)):
+        category = categories.get(photo_url)
+        
+        # Skip if category is None or in skip list
+        if not category or category in SKIP_CATEGORIES:
+            log.info("Skipping photo %s: category=%s (None or in skip list)", idx + 1, category)
+            continue
         
-    except Exception as e:
-        # Safely convert exception to string, handling encoding issues
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while generating images (encoding error)"
+        # Get ImageType for this category
+        image_type = CATEGORY_TO_IMAGE_TYPE.get(category)
         
-        import traceback
-        traceback.print_exc()
+        if not image_type:
+            log.warning("Unknown category '%s' for photo %s...", category, photo_url[:50])
+            continue
         
-        return jsonify({
-            "error": f"An error occurred while generating images: {error_msg}",
+        tasks_to_generate.append((idx, photo_url, image_type))
+    
+    if not tasks_to_generate:
+        return _json({
+            "error": "No photos to generate (all skipped or invalid categories)",
             "task_id": None
-        }), 500
+        }, status=400)
+    
+    # Create task ID for progress tracking
+    task_id = str(uuid.uuid4())
+    
+    # Initialize task progress
+    image_generation_tasks.create(task_id, len(tasks_to_generate))
+    
+    log.info("Created task %s for %s image(s)", task_id, len(tasks_to_generate))
+    
+    # Submit straight to the shared pool; whichever image finishes last settles the task status
+    remaining = [len(tasks_to_generate)]
+    remaining_lock = threading.Lock()
+
+    def on_image_done(future):
+        with remaining_lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            _finish_generation_task(task_id)
+        except Exception as e:
+            # Never leave the task "running", or status streams would wait on it forever
+            log.exception("Error finishing generation task %s", task_id)
+            image_generation_tasks.append_error(task_id, str(e))
+            image_generation_tasks.set_status(task_id, "failed")
+
+    for idx, photo_url, image_type in tasks_to_generate:
+        IMAGE_GEN_POOL.submit(
+            generate_image_rate_limited,
+            photo_url, image_type, idx, task_id=task_id,
+            prompt_modifier=prompt_modifier if prompt_modifier else None,
+            image_model=image_model,
+        ).add_done_callback(on_image_done)
+    
+    # Return task ID immediately
+    return _json({
+        "task_id": task_id,
+        "total_images": len(tasks_to_generate),
+        "error": None
+    })
 
 @app.route('/api/regenerate-images', methods=['POST'])
-def regenerate_images():
+@api_error_handler("An error occurred while regenerating images", generated_images=[])
+@json_body(required_keys=("image_urls", "prompt"), generated_images=[])
+def regenerate_images(data):
     """
     Regenerate images using a custom prompt.
     
@@ -516,103 +791,95 @@ def regenerate_images():
     Returns:
         JSON response with regenerated image URLs, or error message
     """
-    try:
-        print("[API] /api/regenerate-images endpoint called")
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                "error": "Request body must be JSON",
-                "generated_images": []
-            }), 400
-        
-        image_urls = data.get("image_urls", [])
-        prompt = data.get("prompt", "")
-        image_model = data.get("image_model") or DEFAULT_IMAGE_MODEL
-        
-        if not image_urls or not isinstance(image_urls, list):
-            return jsonify({
-                "error": "image_urls must be a non-empty array",
-                "generated_images": []
-            }), 400
-        
-        if not prompt or not isinstance(prompt, str) or not prompt.strip():
-            return jsonify({
-                "error": "prompt must be a non-empty string",
-                "generated_images": []
-            }), 400
-        
-        print(f"[API] Regenerating {len(image_urls)} image(s) with custom prompt")
-        
-        generated_images = []
-        errors = []
-        
-        # Regenerate each image with custom prompt
-        # Use EXPERIMENTAL type since we're using custom prompt
-        for idx, image_url in enumerate(image_urls):
-            try:
-                print(f"[API] Regenerating image {idx + 1}/{len(image_urls)}...")
+    log.debug("/api/regenerate-images endpoint called")
+    
+    image_urls = data.get("image_urls", [])
+    prompt = data.get("prompt", "")
+    image_model = data.get("image_model") or DEFAULT_IMAGE_MODEL
+    
+    if not image_urls or not isinstance(image_urls, list):
+        return _json({
+            "error": "image_urls must be a non-empty array",
+            "generated_images": []
+        }, status=400)
+    
+    if not prompt or not isinstance(prompt, str) or not prompt.strip():
+        return _json({
+            "error": "prompt must be a non-empty string",
+            "generated_images": []
+        }, status=400)
+    
+    log.info("Regenerating %s image(s) with custom prompt", len(image_urls))
+    
+    custom_prompt = prompt.strip()
+
+    def regenerate_one(idx, image_url):
+        """Regenerate a single image; returns (result, error_msg)."""
+        try:
+            log.info("Regenerating image %s/%s...", idx + 1, len(image_urls))
+            # Use EXPERIMENTAL type since we're using custom prompt
+            image_gen_rate_limiter.acquire()
+            with image_gen_slots:
                 result = generate_image_from_urls(
                     [image_url],
                     ImageType.EXPERIMENTAL,
-                    custom_prompt=prompt.strip(),
+                    custom_prompt=custom_prompt,
                     model=image_model,
                 )
-                
-                if result and isinstance(result, list):
-                    generated_images.extend(result)
-                    print(f"[API] Successfully regenerated {len(result)} image(s) for image {idx + 1}")
-                elif result:
-                    generated_images.append(result)
-                    print(f"[API] Successfully regenerated 1 image for image {idx + 1}")
-                else:
-                    errors.append(f"Failed to regenerate image {idx + 1}")
-            except Exception as e:
-                error_msg = f"Error regenerating image {idx + 1}: {str(e)}"
-                print(f"[API] Exception: {error_msg}")
-                import traceback
-                traceback.print_exc()
-                errors.append(error_msg)
-        
-        print(f"[API] Regeneration complete: {len(generated_images)} images generated, {len(errors)} errors")
-        
-        response_data = {
-            "generated_images": generated_images,
-            "error": None
-        }
-        
-        if errors:
-            response_data["warnings"] = errors
-        
-        return jsonify(response_data), 200
-        
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while regenerating images (encoding error)"
-        
-        return jsonify({
-            "error": f"An error occurred while regenerating images: {error_msg}",
-            "generated_images": []
-        }), 500
+            if not result:
+                return None, f"Failed to regenerate image {idx + 1}"
+            return result, None
+        except Exception as e:
+            error_msg = f"Error regenerating image {idx + 1}: {str(e)}"
+            log.exception("Exception: %s", error_msg)
+            return None, error_msg
+
+    # Regenerate each distinct URL once on the shared generation pool; duplicates reuse that result
+    url_to_outcome = {}
+    futures = {
+        IMAGE_GEN_POOL.submit(regenerate_one, idx, image_url): image_url
+        for idx, image_url in enumerate(dict.fromkeys(image_urls))
+    }
+    for future in as_completed(futures):
+        url_to_outcome[futures[future]] = future.result()
+
+    # Fan back out in input order so the frontend can map results by index
+    generated_images = []
+    errors = []
+    for idx, image_url in enumerate(image_urls):
+        result, error_msg = url_to_outcome[image_url]
+        if error_msg:
+            errors.append(error_msg)
+        elif isinstance(result, list):
+            generated_images.extend(result)
+            log.info("Successfully regenerated %s image(s) for image %s", len(result), idx + 1)
+        else:
+            generated_images.append(result)
+            log.info("Successfully regenerated 1 image for image %s", idx + 1)
+    
+    log.info("Regeneration complete: %s images generated, %s errors", len(generated_images), len(errors))
+    
+    response_data = {
+        "generated_images": generated_images,
+        "error": None
+    }
+    
+    if errors:
+        response_data["warnings"] = errors
+    
+    return _json(response_data)
 
 @app.route('/api/create-listing', methods=['POST'])
-def create_listing():
+@json_body(required_keys=("generated_images", "listing", "sku"), stream=True)
+def create_listing(data):
     """
     Update an existing listing JSON file with generated images, generate optimized text, and update listing.
     Streams real-time progress events as NDJSON so the frontend can show accurate status.
     """
-    # Parse request body before streaming (can't access request inside generator after response starts)
-    data = request.get_json()
-
+    # Body is parsed by json_body before streaming (can't access request inside generator after response starts)
     def generate():
         try:
-            print("[API] /api/create-listing endpoint called")
-
-            if not data:
-                yield error_event("Request body must be JSON")
-                return
+            log.debug("/api/create-listing endpoint called")
 
             generated_images = data.get("generated_images", [])
             listing = data.get("listing", {})
@@ -635,26 +902,25 @@ def create_listing():
                 yield error_event("sku is required in request body")
                 return
 
-            print(f"[API] Updating listing with {len(generated_images)} image(s)")
-            print(f"[API] Using SKU: {sku}")
+            log.info("Updating listing with %s image(s)", len(generated_images))
+            log.info("Using SKU: %s", sku)
 
             # Step 1: Updating images
             yield progress_event('Updating images', 'in_progress')
 
-            from backend.copyScripts.combine_data import listing_file_exists
             if not listing_file_exists(sku):
-                print(f"[API] File doesn't exist for SKU {sku}, creating it...")
+                log.info("File doesn't exist for SKU %s, creating it...", sku)
                 create_listing_with_preferences(sku=sku, models=models_payload)
-                print(f"[API] Created listing JSON file for SKU: {sku}")
+                log.info("Created listing JSON file for SKU: %s", sku)
             else:
-                print(f"[API] File exists for SKU {sku}, updating existing file")
-                update_listing_models(sku, models_payload)
+                log.info("File exists for SKU %s, updating existing file", sku)
 
-            update_listing_images(sku, generated_images)
-            print(f"[API] Added {len(generated_images)} image(s) to listing")
+            # Images are applied in memory with the other steps below
             yield progress_event('Updating images', 'completed')
 
-            # Step 2: Generating optimized text (skip LLM if text was pre-generated client-side)
+            # Step 2: Generating optimized text (skip LLM if text was pre-generated client-side).
+            # The slow LLM calls run before the listing is opened for editing, so the
+            # read-modify-write window below only spans the in-memory updates
             yield progress_event('Generating optimized text', 'in_progress')
 
             old_title = listing.get("title", "")
@@ -667,83 +933,109 @@ def create_listing():
                 # Text was already generated via /api/generate-text; just persist it
                 pending_title = pre_generated_text["edited_title"]
                 pending_description = pre_generated_text.get("edited_description", "")
-                print(f"[API] Used pre-generated text (skipped LLM)")
+                log.info("Used pre-generated text (skipped LLM)")
             elif old_title and old_description:
-                print(f"[API] Generating optimized text...")
+                log.info("Generating optimized text...")
                 optimized_content = create_text(old_title, old_description, model=text_model)
                 if optimized_content:
                     pending_title = optimized_content.get("edited_title", old_title)
                     pending_description = optimized_content.get("edited_description", old_description)
                 else:
-                    print(f"[API] Warning: Failed to generate optimized text, using original")
+                    log.warning("Failed to generate optimized text, using original")
                     pending_title = old_title
                     pending_description = old_description
             else:
-                print(f"[API] Warning: No title/description provided, skipping text generation")
-
-            if pending_title:
-                if not pre_generated_text:
-                    # Only nudge if text was NOT pre-generated (nudge already ran in /api/generate-text)
-                    title_len = len(pending_title)
-                    if not (TITLE_MIN_LEN <= title_len <= TITLE_MAX_LEN):
-                        print(
-                            f"[API] Title length {title_len} outside [{TITLE_MIN_LEN},{TITLE_MAX_LEN}], "
-                            f"auto-nudging..."
-                        )
-                        nudged_title, nudge_log = _nudge_title_length(pending_title, text_model)
-                        if nudged_title:
-                            pending_title = nudged_title
-                            print(
-                                f"[API] Nudge result: {len(nudged_title)} chars, "
-                                f"{len(nudge_log)} attempt(s), title='{nudged_title}'"
-                            )
-                    # If description is empty (e.g. streaming failed), fall back to what's on disk
-                    desc_to_save = pending_description
-                    if not desc_to_save:
-                        existing = load_listing_data(sku=sku)
-                        desc_to_save = (
-                            existing.get("inventoryItem", {}).get("product", {}).get("description", "")
-                            if existing else ""
+                log.warning("No title/description provided, skipping text generation")
+
+            if pending_title and not pre_generated_text:
+                # Only nudge if text was NOT pre-generated (nudge already ran in /api/generate-text)
+                title_len = len(pending_title)
+                if not (TITLE_MIN_LEN <= title_len <= TITLE_MAX_LEN):
+                    log.info(
+                        "Title length %s outside [%s,%s], auto-nudging...",
+                        title_len,
+                        TITLE_MIN_LEN,
+                        TITLE_MAX_LEN,
+                    )
+                    nudged_title, nudge_log = _nudge_title_length(pending_title, text_model)
+                    if nudged_title:
+                        pending_title = nudged_title
+                        log.info(
+                            "Nudge result: %s chars, %s attempt(s), title='%s'",
+                            len(nudged_title),
+                            len(nudge_log),
+                            nudged_title,
                         )
-                else:
-                    desc_to_save = pending_description
-                update_listing_title_description(sku, {
-                    "edited_title": pending_title,
-                    "edited_description": desc_to_save,
-                })
 
             yield progress_event('Generating optimized text', 'completed')
 
-            # Step 3: Updating metadata
+            # Step 3: Updating metadata (applied in memory below)
             yield progress_event('Updating metadata', 'in_progress')
 
             price = listing.get("price", "0")
             category_id = listing.get("categoryId", "")
 
-            if price and category_id:
-                update_listing_meta_data(sku, str(price), str(category_id))
-                print(f"[API] Updated listing metadata: price={price}, categoryId={category_id}")
-
             yield progress_event('Updating metadata', 'completed')
 
-            # Step 4: Updating aspects
+            # Step 4: Updating aspects. Resolve them before the edit window opens, so the
+            # Taxonomy API call (when /api/photos didn't pre-fetch them) happens outside it
             yield progress_event('Updating aspects', 'in_progress')
 
             localized_aspects = listing.get("localizedAspects") or []
             pre_fetched_aspects = listing.get("preFetchedAspects")  # pre-computed during /api/photos
-            update_listing_with_aspects(sku, localized_aspects, pre_fetched_aspects=pre_fetched_aspects)
-            print(f"[API] Updated listing with aspects")
+            if not pre_fetched_aspects:
+                # The category the listing will have once the metadata step is applied
+                if price and category_id:
+                    aspects_category_id = category_id
+                else:
+                    aspects_category_id = (load_listing_data(sku=sku) or {}).get("offer", {}).get("categoryId")
+                if aspects_category_id:
+                    try:
+                        pre_fetched_aspects = compute_aspects_for_category(str(aspects_category_id), localized_aspects)
+                    except Exception as e:
+                        log.warning("Aspect lookup for category %s failed: %s", aspects_category_id, e)
+
+            # Apply every step to one in-memory copy of the listing, read once and written
+            # once (atomically) on exit; nothing in here yields, so a client disconnect
+            # can't abandon the edit halfway
+            with edit_listing(sku) as listing_data:
+                apply_listing_models(listing_data, models_payload)
+                apply_listing_images(listing_data, generated_images)
+                log.info("Added %s image(s) to listing", len(generated_images))
+
+                if pending_title:
+                    # If description is empty (e.g. streaming failed), keep what the listing has
+                    desc_to_save = pending_description
+                    if not pre_generated_text and not desc_to_save:
+                        desc_to_save = listing_data.get("inventoryItem", {}).get("product", {}).get("description", "")
+                    try:
+                        apply_listing_title_description(listing_data, {
+                            "edited_title": pending_title,
+                            "edited_description": desc_to_save,
+                        })
+                    except (ValueError, KeyError) as e:
+                        log.warning("Skipped title/description update: %s", e)
+
+                if price and category_id:
+                    try:
+                        apply_listing_meta_data(listing_data, str(price), str(category_id))
+                        log.info("Updated listing metadata: price=%s, categoryId=%s", price, category_id)
+                    except KeyError as e:
+                        log.warning("Skipped metadata update, listing is missing %s", e)
+
+                if pre_fetched_aspects:
+                    try:
+                        apply_listing_aspects(listing_data, localized_aspects, pre_fetched_aspects=pre_fetched_aspects)
+                        log.info("Updated listing with aspects")
+                    except (ValueError, KeyError) as e:
+                        log.warning("Skipped aspects update: %s", e)
+                else:
+                    log.warning("Skipped aspects update: could not determine aspects for the listing's category")
 
+            # The last step completes only once the listing file has been written
             yield progress_event('Updating aspects', 'completed')
 
-            # Load and return the complete listing data
-            listing_data = load_listing_data(sku=sku)
-
-            if not listing_data:
-                yield error_event("Failed to load created listing data")
-                return
-
-            print(f"[API] Successfully created listing: {sku}")
+            log.info("Successfully created listing: %s", sku)
 
             yield result_event({
                 "listing_data": listing_data,
@@ -751,20 +1043,14 @@ def create_listing():
             })
 
         except Exception as e:
-            try:
-                error_msg = str(e)
-            except UnicodeEncodeError:
-                error_msg = "An error occurred while creating listing (encoding error)"
-
-            import traceback
-            traceback.print_exc()
-
-            yield error_event(f"An error occurred while creating listing: {error_msg}")
+            log.exception("Error creating listing")
+            yield error_event(f"An error occurred while creating listing: {e}")
 
     return streaming_response(generate())
 
 
 @app.route('/api/update-listing-images', methods=['POST'])
+@api_error_handler(listing_data=None)
 def update_listing_images_endpoint():
     """
     Update only the image URLs in a listing JSON file.
@@ -779,41 +1065,29 @@ def update_listing_images_endpoint():
     Returns:
         JSON with listing_data from disk, or error message
     """
-    try:
-        print("[API] /api/update-listing-images endpoint called")
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({"error": "Request body must be JSON", "listing_data": None}), 400
-        
-        sku = data.get("sku")
-        image_urls = data.get("image_urls", [])
-        
-        if not sku or not isinstance(sku, str):
-            return jsonify({"error": "sku must be a non-empty string", "listing_data": None}), 400
-        
-        if not image_urls or not isinstance(image_urls, list):
-            return jsonify({"error": "image_urls must be a non-empty array", "listing_data": None}), 400
-        
-        from backend.copyScripts.combine_data import listing_file_exists
-        if not listing_file_exists(sku):
-            return jsonify({"error": f"Listing file not found for SKU {sku}. Cannot update images.", "listing_data": None}), 404
+    log.debug("/api/update-listing-images endpoint called")
+    data = request.get_json()
+    
+    if not data:
+        return _json({"error": "Request body must be JSON", "listing_data": None}, status=400)
+    
+    sku = data.get("sku")
+    image_urls = data.get("image_urls", [])
+    
+    if not sku or not isinstance(sku, str):
+        return _json({"error": "sku must be a non-empty string", "listing_data": None}, status=400)
+    
+    if not image_urls or not isinstance(image_urls, list):
+        return _json({"error": "image_urls must be a non-empty array", "listing_data": None}, status=400)
+    
+    if not listing_file_exists(sku):
+        return _json({"error": f"Listing file not found for SKU {sku}. Cannot update images.", "listing_data": None}, status=404)
 
-        success = update_listing_images(sku, image_urls)
-        if not success:
-            return jsonify({"error": "Failed to update listing images", "listing_data": None}), 500
-        
-        listing_data = load_listing_data(sku=sku)
-        return jsonify({"listing_data": listing_data, "error": None}), 200
-        
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while updating listing images (encoding error)"
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": error_msg, "listing_data": None}), 500
+    listing_data = update_listing_images(sku, image_urls)
+    if not listing_data:
+        return _json({"error": "Failed to update listing images", "listing_data": None}, status=500)
+    
+    return _json({"listing_data": listing_data, "error": None})
 
 
 TITLE_MIN_LEN = 70
@@ -872,9 +1146,9 @@ def _nudge_title_length(current_title, text_model):
         in_words = len(working_title.split())
 
         if TITLE_MIN_LEN <= in_len <= TITLE_MAX_LEN:
-            print(
-                f"[TITLE_NUDGE] attempt={attempt - 1} status=in_range "
-                f"length={in_len} title='{working_title}'"
+            log.info(
+                "[TITLE_NUDGE] attempt=%s status=in_range length=%s title='%s'",
+                attempt - 1, in_len, working_title,
             )
             break
 
@@ -885,7 +1159,7 @@ def _nudge_title_length(current_title, text_model):
             target_words = max(1, round(TITLE_TARGET_LEN / 6))
             words_to_remove = max(1, round(chars_delta / 6))
             if not template:
-                print("[TITLE_NUDGE] decrease prompt template missing; aborting loop")
+                log.warning("[TITLE_NUDGE] decrease prompt template missing; aborting loop")
                 break
             prompt = template.format(
                 current_title=working_title,
@@ -902,7 +1176,7 @@ def _nudge_title_length(current_title, text_model):
             target_words = max(1, round(TITLE_TARGET_LEN / 6))
             words_to_add = max(1, round(chars_delta / 6))
             if not template:
-                print("[TITLE_NUDGE] increase prompt template missing; aborting loop")
+                log.warning("[TITLE_NUDGE] increase prompt template missing; aborting loop")
                 break
             prompt = template.format(
                 current_title=working_title,
@@ -913,19 +1187,18 @@ def _nudge_title_length(current_title, text_model):
                 words_to_add=words_to_add,
             )
 
-        print(
-            f"[TITLE_NUDGE] attempt={attempt} direction={direction} "
-            f"in_length={in_len} chars_delta={chars_delta} "
-            f"in_title='{working_title}'"
+        log.info(
+            "[TITLE_NUDGE] attempt=%s direction=%s in_length=%s chars_delta=%s in_title='%s'",
+            attempt, direction, in_len, chars_delta, working_title,
         )
 
         raw_response = call_text_llm(prompt, model=text_model)
         new_title = _sanitize_title(raw_response)
 
         if not new_title:
-            print(
-                f"[TITLE_NUDGE] attempt={attempt} direction={direction} "
-                f"result=empty_response keeping_previous"
+            log.info(
+                "[TITLE_NUDGE] attempt=%s direction=%s result=empty_response keeping_previous",
+                attempt, direction,
             )
             attempts_log.append({
                 "attempt": attempt,
@@ -942,10 +1215,9 @@ def _nudge_title_length(current_title, text_model):
         delta = out_len - in_len
         in_range = TITLE_MIN_LEN <= out_len <= TITLE_MAX_LEN
 
-        print(
-            f"[TITLE_NUDGE] attempt={attempt} direction={direction} "
-            f"in_length={in_len} out_length={out_len} delta={delta:+d} "
-            f"in_range={in_range} out_title='{new_title}'"
+        log.info(
+            "[TITLE_NUDGE] attempt=%s direction=%s in_length=%s out_length=%s delta=%+d in_range=%s out_title='%s'",
+            attempt, direction, in_len, out_len, delta, in_range, new_title,
         )
 
         attempts_log.append({
@@ -980,16 +1252,16 @@ def _nudge_title_length(current_title, text_model):
             # Everything is over 80 — pick the shortest (least bad)
             best = min(candidates, key=len)
 
-    print(
-        f"[TITLE_NUDGE] final length={len(best)} "
-        f"in_range={TITLE_MIN_LEN <= len(best) <= TITLE_MAX_LEN} "
-        f"attempts={len(attempts_log)} title='{best}'"
+    log.info(
+        "[TITLE_NUDGE] final length=%s in_range=%s attempts=%s title='%s'",
+        len(best), TITLE_MIN_LEN <= len(best) <= TITLE_MAX_LEN, len(attempts_log), best,
     )
 
     return best, attempts_log
 
 
 @app.route('/api/trim-title', methods=['POST'])
+@api_error_handler("An error occurred while trimming title")
 def trim_title():
     """
     Use AI to nudge a listing title into the 70-80 character range.
@@ -1011,80 +1283,61 @@ def trim_title():
     Returns:
         JSON with trimmed_title (and attempts metadata for debugging)
     """
-    try:
-        print("[API] /api/trim-title endpoint called")
-        data = request.get_json()
-
-        if not data:
-            return jsonify({"error": "Request body must be JSON"}), 400
+    log.debug("/api/trim-title endpoint called")
+    data = request.get_json()
 
-        current_title = data.get("title", "")
-        sku = data.get("sku")
+    if not data:
+        return _json({"error": "Request body must be JSON"}, status=400)
 
-        if not current_title:
-            return jsonify({"error": "title is required"}), 400
+    current_title = data.get("title", "")
+    sku = data.get("sku")
 
-        current_length = len(current_title)
-        print(
-            f"[API] /api/trim-title input length={current_length} "
-            f"title='{current_title}'"
-        )
+    if not current_title:
+        return _json({"error": "title is required"}, status=400)
 
-        if TITLE_MIN_LEN <= current_length <= TITLE_MAX_LEN:
-            print(f"[API] Title already in range ({current_length} chars), no nudge needed")
-            return jsonify({
-                "trimmed_title": current_title,
-                "attempts": [],
-                "original_length": current_length,
-                "final_length": current_length,
-            }), 200
+    current_length = len(current_title)
+    log.info("/api/trim-title input length=%s title='%s'", current_length, current_title)
 
-        text_model = data.get("text_model") or DEFAULT_TEXT_MODEL
-        final_title, attempts_log = _nudge_title_length(current_title, text_model)
-
-        if not final_title:
-            return jsonify({"error": "Failed to get response from AI"}), 502
+    if TITLE_MIN_LEN <= current_length <= TITLE_MAX_LEN:
+        log.info("Title already in range (%s chars), no nudge needed", current_length)
+        return _json({
+            "trimmed_title": current_title,
+            "attempts": [],
+            "original_length": current_length,
+            "final_length": current_length,
+        })
 
-        print(
-            f"[API] Final title: '{final_title}' ({len(final_title)} chars) "
-            f"after {len(attempts_log)} attempt(s)"
-        )
+    text_model = data.get("text_model") or DEFAULT_TEXT_MODEL
+    final_title, attempts_log = _nudge_title_length(current_title, text_model)
 
-        # Update listing file if sku provided
-        if sku:
-            try:
-                listing_data = load_listing_data(sku=sku)
-                if listing_data:
-                    update_listing_title_description(sku, {
-                        "edited_title": final_title,
-                        "edited_description": listing_data.get("inventoryItem", {}).get("product", {}).get("description", "")
-                    })
-                    print(f"[API] Updated listing {sku} with nudged title")
-            except Exception as e:
-                print(f"[API] Warning: Could not update listing file: {e}")
+    if not final_title:
+        return _json({"error": "Failed to get response from AI"}, status=502)
 
-        return jsonify({
-            "trimmed_title": final_title,
-            "attempts": attempts_log,
-            "original_length": current_length,
-            "final_length": len(final_title),
-        }), 200
+    log.info("Final title: '%s' (%s chars) after %s attempt(s)", final_title, len(final_title), len(attempts_log))
 
-    except Exception as e:
+    # Update listing file if sku provided
+    if sku:
         try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while trimming title (encoding error)"
-
-        import traceback
-        traceback.print_exc()
+            listing_data = load_listing_data(sku=sku)
+            if listing_data:
+                update_listing_title_description(sku, {
+                    "edited_title": final_title,
+                    "edited_description": listing_data.get("inventoryItem", {}).get("product", {}).get("description", "")
+                })
+                log.info("Updated listing %s with nudged title", sku)
+        except Exception as e:
+            log.warning("Could not update listing file: %s", e)
 
-        return jsonify({
-            "error": f"An error occurred while trimming title: {error_msg}"
-        }), 500
+    return _json({
+        "trimmed_title": final_title,
+        "attempts": attempts_log,
+        "original_length": current_length,
+        "final_length": len(final_title),
+    })
 
 
 @app.route('/api/update-title', methods=['POST'])
+@api_error_handler("An error occurred while updating title")
 def update_title():
     """
     Update just the title of an existing listing.
@@ -1095,52 +1348,39 @@ def update_title():
         "title": "new title text"
     }
     """
-    try:
-        print("[API] /api/update-title endpoint called")
-        data = request.get_json()
-
-        if not data:
-            return jsonify({"error": "Request body must be JSON"}), 400
-
-        sku = data.get("sku")
-        new_title = data.get("title", "")
-
-        if not sku:
-            return jsonify({"error": "sku is required"}), 400
-        if not new_title:
-            return jsonify({"error": "title is required"}), 400
+    log.debug("/api/update-title endpoint called")
+    data = request.get_json()
 
-        listing_data = load_listing_data(sku=sku)
-        if not listing_data:
-            return jsonify({"error": f"Listing not found for SKU: {sku}"}), 404
+    if not data:
+        return _json({"error": "Request body must be JSON"}, status=400)
 
-        current_desc = listing_data.get("inventoryItem", {}).get("product", {}).get("description", "")
-        update_listing_title_description(sku, {
-            "edited_title": new_title,
-            "edited_description": current_desc
-        })
+    sku = data.get("sku")
+    new_title = data.get("title", "")
 
-        print(f"[API] Updated title for {sku}: '{new_title}' ({len(new_title)} chars)")
+    if not sku:
+        return _json({"error": "sku is required"}, status=400)
+    if not new_title:
+        return _json({"error": "title is required"}, status=400)
 
-        # Reload to return updated data
-        updated_data = load_listing_data(sku=sku)
-        return jsonify({"listing_data": updated_data}), 200
+    listing_data = load_listing_data(sku=sku)
+    if not listing_data:
+        return _json({"error": f"Listing not found for SKU: {sku}"}, status=404)
 
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while updating title (encoding error)"
+    current_desc = listing_data.get("inventoryItem", {}).get("product", {}).get("description", "")
+    update_listing_title_description(sku, {
+        "edited_title": new_title,
+        "edited_description": current_desc
+    })
 
-        import traceback
-        traceback.print_exc()
+    log.info("Updated title for %s: '%s' (%s chars)", sku, new_title, len(new_title))
 
-        return jsonify({
-            "error": f"An error occurred while updating title: {error_msg}"
-        }), 500
+    # Reload to return updated data
+    updated_data = load_listing_data(sku=sku)
+    return _json({"listing_data": updated_data})
 
 
 @app.route('/api/regenerate-title', methods=['POST'])
+@api_error_handler("An error occurred while regenerating title")
 def regenerate_title():
     """
     Regenerate the listing title using the LLM.
@@ -1153,60 +1393,51 @@ def regenerate_title():
         "model": "deepseek/deepseek-v4-flash"
     }
     """
-    try:
-        print("[API] /api/regenerate-title endpoint called")
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "Request body must be JSON"}), 400
-
-        sku = data.get("sku")
-        current_title = data.get("current_title", "")
-        user_prompt = data.get("user_prompt", "")
-        model = data.get("model", DEFAULT_TEXT_MODEL)
-
-        if not sku:
-            return jsonify({"error": "sku is required"}), 400
-        if not current_title:
-            return jsonify({"error": "current_title is required"}), 400
-        if not user_prompt:
-            return jsonify({"error": "user_prompt is required"}), 400
-
-        listing_data = load_listing_data(sku=sku)
-        if not listing_data:
-            return jsonify({"error": f"Listing not found for SKU: {sku}"}), 404
-
-        prompt = (
-            f"Here is an eBay listing title:\n\n{current_title}\n\n"
+    log.debug("/api/regenerate-title endpoint called")
+    data = request.get_json()
+    if not data:
+        return _json({"error": "Request body must be JSON"}, status=400)
+
+    sku = data.get("sku")
+    current_title = data.get("current_title", "")
+    user_prompt = data.get("user_prompt", "")
+    model = data.get("model", DEFAULT_TEXT_MODEL)
+
+    if not sku:
+        return _json({"error": "sku is required"}, status=400)
+    if not current_title:
+        return _json({"error": "current_title is required"}, status=400)
+    if not user_prompt:
+        return _json({"error": "user_prompt is required"}, status=400)
+
+    listing_data = load_listing_data(sku=sku)
+    if not listing_data:
+        return _json({"error": f"Listing not found for SKU: {sku}"}, status=404)
+
+    prompt = (
+        f"Here is an eBay listing title:\n\n{current_title}\n\n"
             f"Please edit the title according to this instruction: {user_prompt}\n\n"
             "Return only the new title text, no quotes, no explanation."
-        )
-        result = call_text_llm(prompt, model=model)
-        if not result:
-            return jsonify({"error": "LLM returned no response"}), 500
-
-        new_title = result.strip().strip('"').strip("'")
-        print(f"[API] Regenerated title for {sku}: '{new_title}' ({len(new_title)} chars)")
+    )
+    result = call_text_llm(prompt, model=model)
+    if not result:
+        return _json({"error": "LLM returned no response"}, status=500)
 
-        current_desc = listing_data.get("inventoryItem", {}).get("product", {}).get("description", "")
-        update_listing_title_description(sku, {
-            "edited_title": new_title,
-            "edited_description": current_desc
-        })
+    new_title = result.strip().strip('"').strip("'")
+    log.info("Regenerated title for %s: '%s' (%s chars)", sku, new_title, len(new_title))
 
-        updated_data = load_listing_data(sku=sku)
-        return jsonify({"title": new_title, "listing_data": updated_data}), 200
+    current_desc = listing_data.get("inventoryItem", {}).get("product", {}).get("description", "")
+    update_listing_title_description(sku, {
+        "edited_title": new_title,
+        "edited_description": current_desc
+    })
 
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while regenerating title (encoding error)"
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": f"An error occurred while regenerating title: {error_msg}"}), 500
+    updated_data = load_listing_data(sku=sku)
+    return _json({"title": new_title, "listing_data": updated_data})
 
 
 @app.route('/api/regenerate-description', methods=['POST'])
+@api_error_handler("An error occurred while regenerating description")
 def regenerate_description():
     """
     Regenerate the listing description using the LLM.
@@ -1219,60 +1450,51 @@ def regenerate_description():
         "model": "deepseek/deepseek-v4-flash"
     }
     """
-    try:
-        print("[API] /api/regenerate-description endpoint called")
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "Request body must be JSON"}), 400
-
-        sku = data.get("sku")
-        current_description = data.get("current_description", "")
-        user_prompt = data.get("user_prompt", "")
-        model = data.get("model", DEFAULT_TEXT_MODEL)
-
-        if not sku:
-            return jsonify({"error": "sku is required"}), 400
-        if not current_description:
-            return jsonify({"error": "current_description is required"}), 400
-        if not user_prompt:
-            return jsonify({"error": "user_prompt is required"}), 400
-
-        listing_data = load_listing_data(sku=sku)
-        if not listing_data:
-            return jsonify({"error": f"Listing not found for SKU: {sku}"}), 404
-
-        prompt = (
-            f"Here is an eBay listing description (HTML):\n\n{current_description}\n\n"
+    log.debug("/api/regenerate-description endpoint called")
+    data = request.get_json()
+    if not data:
+        return _json({"error": "Request body must be JSON"}, status=400)
+
+    sku = data.get("sku")
+    current_description = data.get("current_description", "")
+    user_prompt = data.get("user_prompt", "")
+    model = data.get("model", DEFAULT_TEXT_MODEL)
+
+    if not sku:
+        return _json({"error": "sku is required"}, status=400)
+    if not current_description:
+        return _json({"error": "current_description is required"}, status=400)
+    if not user_prompt:
+        return _json({"error": "user_prompt is required"}, status=400)
+
+    listing_data = load_listing_data(sku=sku)
+    if not listing_data:
+        return _json({"error": f"Listing not found for SKU: {sku}"}, status=404)
+
+    prompt = (
+        f"Here is an eBay listing description (HTML):\n\n{current_description}\n\n"
             f"Please edit the description according to this instruction: {user_prompt}\n\n"
             "Return only the new description HTML, no explanation, no markdown fences."
-        )
-        result = call_text_llm(prompt, model=model)
-        if not result:
-            return jsonify({"error": "LLM returned no response"}), 500
+    )
+    result = call_text_llm(prompt, model=model)
+    if not result:
+        return _json({"error": "LLM returned no response"}, status=500)
 
-        new_description = result.strip()
-        print(f"[API] Regenerated description for {sku}: {len(new_description)} chars")
+    new_description = result.strip()
+    log.info("Regenerated description for %s: %s chars", sku, len(new_description))
 
-        current_title = listing_data.get("inventoryItem", {}).get("product", {}).get("title", "")
-        update_listing_title_description(sku, {
-            "edited_title": current_title,
-            "edited_description": new_description
-        })
-
-        updated_data = load_listing_data(sku=sku)
-        return jsonify({"description": new_description, "listing_data": updated_data}), 200
+    current_title = listing_data.get("inventoryItem", {}).get("product", {}).get("title", "")
+    update_listing_title_description(sku, {
+        "edited_title": current_title,
+        "edited_description": new_description
+    })
 
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while regenerating description (encoding error)"
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": f"An error occurred while regenerating description: {error_msg}"}), 500
+    updated_data = load_listing_data(sku=sku)
+    return _json({"description": new_description, "listing_data": updated_data})
 
 
 @app.route('/api/regenerate-metadata', methods=['POST'])
+@api_error_handler("An error occurred while regenerating metadata")
 def regenerate_metadata():
     """
     Regenerate listing metadata (aspects, condition, price, category) using LLM.
@@ -1284,87 +1506,76 @@ def regenerate_metadata():
         "model": "deepseek/deepseek-v4-flash"
     }
     """
-    try:
-        print("[API] /api/regenerate-metadata endpoint called")
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "Request body must be JSON"}), 400
+    log.debug("/api/regenerate-metadata endpoint called")
+    data = request.get_json()
+    if not data:
+        return _json({"error": "Request body must be JSON"}, status=400)
 
-        sku = data.get("sku")
-        user_prompt = data.get("user_prompt", "")
-        model = data.get("model", DEFAULT_TEXT_MODEL)
+    sku = data.get("sku")
+    user_prompt = data.get("user_prompt", "")
+    model = data.get("model", DEFAULT_TEXT_MODEL)
 
-        if not sku:
-            return jsonify({"error": "sku is required"}), 400
-        if not user_prompt:
-            return jsonify({"error": "user_prompt is required"}), 400
+    if not sku:
+        return _json({"error": "sku is required"}, status=400)
+    if not user_prompt:
+        return _json({"error": "user_prompt is required"}, status=400)
 
-        listing_data = load_listing_data(sku=sku)
-        if not listing_data:
-            return jsonify({"error": f"Listing not found for SKU: {sku}"}), 404
+    listing_data = load_listing_data(sku=sku)
+    if not listing_data:
+        return _json({"error": f"Listing not found for SKU: {sku}"}, status=404)
 
-        metadata = extract_metadata_for_llm(listing_data)
-        metadata_json = json.dumps(metadata, indent=2)
+    metadata = extract_metadata_for_llm(listing_data)
+    metadata_json = json.dumps(metadata, indent=2)
 
-        prompt = (
-            f"{metadata_json}\n\n"
+    prompt = (
+        f"{metadata_json}\n\n"
             f"Please edit the JSON according to this instruction and keep it in JSON format.\n\n"
             f"{user_prompt}"
-        )
-        result = call_text_llm(prompt, model=model)
-        if not result:
-            return jsonify({"error": "LLM returned no response"}), 500
-
-        # Strip markdown fences if present
-        clean = result.strip()
-        if clean.startswith("```"):
-            parts = clean.split("```")
-            clean = parts[1] if len(parts) > 1 else clean
-            if clean.startswith("json"):
-                clean = clean[4:]
-        clean = clean.strip()
+    )
+    result = call_text_llm(prompt, model=model)
+    if not result:
+        return _json({"error": "LLM returned no response"}, status=500)
+
+    # Strip markdown fences if present
+    clean = result.strip()
+    if clean.startswith("```"):
+        parts = clean.split("```")
+        clean = parts[1] if len(parts) > 1 else clean
+        if clean.startswith("json"):
+            clean = clean[4:]
+    clean = clean.strip()
 
-        try:
-            updated_metadata = json.loads(clean)
-        except json.JSONDecodeError as e:
-            return jsonify({"error": f"LLM returned malformed JSON: {str(e)}. Raw: {result[:300]}"}), 400
-
-        # Merge updated fields back into the listing
-        inventory = listing_data.get("inventoryItem", {})
-        product = inventory.get("product", {})
-        offer = listing_data.get("offer", {})
-
-        if "condition" in updated_metadata:
-            inventory["condition"] = updated_metadata["condition"]
-        if "aspects" in updated_metadata:
-            product["aspects"] = updated_metadata["aspects"]
-        if "price" in updated_metadata:
-            offer.setdefault("pricingSummary", {})["price"] = updated_metadata["price"]
-        if "categoryId" in updated_metadata:
-            offer["categoryId"] = updated_metadata["categoryId"]
-
-        inventory["product"] = product
-        listing_data["inventoryItem"] = inventory
-        listing_data["offer"] = offer
-
-        filepath = resolve_listing_json_path(sku=sku)
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(listing_data, f, indent=2, ensure_ascii=False)
-
-        print(f"[API] Regenerated metadata for {sku}")
-        return jsonify({"metadata": updated_metadata, "listing_data": listing_data}), 200
+    try:
+        updated_metadata = orjson.loads(clean)
+    except orjson.JSONDecodeError as e:
+        return _json({"error": f"LLM returned malformed JSON: {str(e)}. Raw: {result[:300]}"}, status=400)
 
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while regenerating metadata (encoding error)"
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": f"An error occurred while regenerating metadata: {error_msg}"}), 500
+    # Merge updated fields back into the listing
+    inventory = listing_data.get("inventoryItem", {})
+    product = inventory.get("product", {})
+    offer = listing_data.get("offer", {})
+
+    if "condition" in updated_metadata:
+        inventory["condition"] = updated_metadata["condition"]
+    if "aspects" in updated_metadata:
+        product["aspects"] = updated_metadata["aspects"]
+    if "price" in updated_metadata:
+        offer.setdefault("pricingSummary", {})["price"] = updated_metadata["price"]
+    if "categoryId" in updated_metadata:
+        offer["categoryId"] = updated_metadata["categoryId"]
+
+    inventory["product"] = product
+    listing_data["inventoryItem"] = inventory
+    listing_data["offer"] = offer
+
+    write_listing_file(resolve_listing_json_path(sku=sku), listing_data)
+
+    log.info("Regenerated metadata for %s", sku)
+    return _json({"metadata": updated_metadata, "listing_data": listing_data})
 
 
 @app.route('/api/update-description', methods=['POST'])
+@api_error_handler("An error occurred while updating description")
 def update_description():
     """
     Update just the description of an existing listing (HTML allowed).
@@ -1375,51 +1586,38 @@ def update_description():
         "description": "<p>...</p>"
     }
     """
-    try:
-        print("[API] /api/update-description endpoint called")
-        data = request.get_json()
-
-        if not data:
-            return jsonify({"error": "Request body must be JSON"}), 400
-
-        sku = data.get("sku")
-        new_description = data.get("description", "")
-        if new_description is None:
-            new_description = ""
-
-        if not sku:
-            return jsonify({"error": "sku is required"}), 400
+    log.debug("/api/update-description endpoint called")
+    data = request.get_json()
 
-        listing_data = load_listing_data(sku=sku)
-        if not listing_data:
-            return jsonify({"error": f"Listing not found for SKU: {sku}"}), 404
+    if not data:
+        return _json({"error": "Request body must be JSON"}, status=400)
 
-        current_title = listing_data.get("inventoryItem", {}).get("product", {}).get("title", "")
-        update_listing_title_description(sku, {
-            "edited_title": current_title,
-            "edited_description": new_description
-        })
+    sku = data.get("sku")
+    new_description = data.get("description", "")
+    if new_description is None:
+        new_description = ""
 
-        print(f"[API] Updated description for {sku} ({len(new_description)} chars)")
+    if not sku:
+        return _json({"error": "sku is required"}, status=400)
 
-        updated_data = load_listing_data(sku=sku)
-        return jsonify({"listing_data": updated_data}), 200
+    listing_data = load_listing_data(sku=sku)
+    if not listing_data:
+        return _json({"error": f"Listing not found for SKU: {sku}"}, status=404)
 
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while updating description (encoding error)"
+    current_title = listing_data.get("inventoryItem", {}).get("product", {}).get("title", "")
+    update_listing_title_description(sku, {
+        "edited_title": current_title,
+        "edited_description": new_description
+    })
 
-        import traceback
-        traceback.print_exc()
+    log.info("Updated description for %s (%s chars)", sku, len(new_description))
 
-        return jsonify({
-            "error": f"An error occurred while updating description: {error_msg}"
-        }), 500
+    updated_data = load_listing_data(sku=sku)
+    return _json({"listing_data": updated_data})
 
 
 @app.route('/api/listings', methods=['GET'])
+@api_error_handler("An error occurred while listing files", listings=[])
 def list_all_listings():
     """
     Get all generated listings from the Generated_Listings folder.
@@ -1427,88 +1625,38 @@ def list_all_listings():
     Returns:
         JSON response with list of all listings (summary data), or error message
     """
-    try:
-        print("[API] /api/listings endpoint called")
-        # Use absolute path to ensure we're looking in the right directory
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        output_dir = os.path.join(base_dir, "Generated_Listings")
-        
-        if not os.path.exists(output_dir):
-            print(f"[API] Generated_Listings directory does not exist at: {output_dir}")
-            return jsonify({
-                "listings": [],
-                "error": None
-            }), 200
-        
-        listings = []
-        
-        # Get all JSON files in the directory
-        for filename in os.listdir(output_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(output_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        listing_data = json.load(f)
-                    
-                    # Extract summary information
-                    sku = listing_data.get('sku', filename.replace('.json', ''))
-                    title = listing_data.get('inventoryItem', {}).get('product', {}).get('title', 'No title')
-                    description = listing_data.get('inventoryItem', {}).get('product', {}).get('description', '')
-                    price = listing_data.get('offer', {}).get('pricingSummary', {}).get('price', {}).get('value', 'N/A')
-                    currency = listing_data.get('offer', {}).get('pricingSummary', {}).get('price', {}).get('currency', 'USD')
-                    category_id = listing_data.get('offer', {}).get('categoryId', 'N/A')
-                    created_date = listing_data.get('createdDateTime', '')
-                    image_urls = listing_data.get('inventoryItem', {}).get('product', {}).get('imageUrls', [])
-                    image_count = len(image_urls)
-                    quantity = listing_data.get('offer', {}).get('quantity', 0)
-                    
-                    listings.append({
-                        'sku': sku,
-                        'title': title,
-                        'description': description,
-                        'price': price,
-                        'currency': currency,
-                        'categoryId': category_id,
-                        'createdDateTime': created_date,
-                        'imageCount': image_count,
-                        'imageUrls': image_urls,
-                        'quantity': quantity,
-                        'filename': filename,
-                        'fileSku': filename.replace('.json', ''),  # SKU derived from filename
-                        'ebayListingId': str(listing_data.get('ebayListingId') or '').strip(),
-                        'models': listing_data.get('models') or None,
-                    })
-                except Exception as e:
-                    print(f"[API] Error reading {filename}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    continue
-        
-        # Sort by created date (newest first)
-        listings.sort(key=lambda x: x.get('createdDateTime', ''), reverse=True)
-        
-        print(f"[API] Found {len(listings)} listing(s) in {output_dir}")
-        
-        return jsonify({
-            "listings": listings,
+    log.debug("/api/listings endpoint called")
+    output_dir = GENERATED_LISTINGS_DIR
+    
+    if not os.path.exists(output_dir):
+        log.warning("Generated_Listings directory does not exist at: %s", output_dir)
+        return _json({
+            "listings": [],
             "error": None
-        }), 200
-        
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while listing files (encoding error)"
-        
-        import traceback
-        traceback.print_exc()
-        
-        return jsonify({
-            "error": f"An error occurred while listing files: {error_msg}",
-            "listings": []
-        }), 500
+        })
+    
+    # Summaries come from the SQLite sidecar index, which re-reads only files
+    # whose mtime/size changed since the last call. Each row is already JSON,
+    # so the array is streamed row by row instead of built and re-encoded.
+    summaries = iter_listing_summaries_json(output_dir)
+    first = next(summaries, None)
+
+    def generate():
+        yield b'{"listings":['
+        count = 0
+        if first is not None:
+            yield first
+            count = 1
+            for summary_json in summaries:
+                yield b',' + summary_json
+                count += 1
+        yield b'],"error":null}'
+        log.info("Found %s listing(s) in %s", count, output_dir)
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 @app.route('/api/listings/<sku>', methods=['GET'])
+@api_error_handler("An error occurred while fetching listing", listing_data=None)
 def get_listing_detail(sku):
     """
     Get full details of a specific listing by SKU.
@@ -1519,54 +1667,54 @@ def get_listing_detail(sku):
     Returns:
         JSON response with complete listing data, or error message
     """
+    log.debug("/api/listings/%s endpoint called", sku)
+
+    # The file already holds the listing JSON, so once framing-checked its bytes are spliced
+    # into the response as-is (no re-serialize), and the ETag comes from its stat so
+    # a revalidating client gets its 304 without the file being read at all
     try:
-        print(f"[API] /api/listings/{sku} endpoint called")
-        
-        listing_data = load_listing_data(sku=sku)
-        
-        if not listing_data:
-            return jsonify({
-                "error": f"Listing not found for SKU: {sku}",
-                "listing_data": None
-            }), 404
-        
-        print(f"[API] Successfully loaded listing data for SKU: {sku}")
-        
-        return jsonify({
-            "listing_data": listing_data,
-            "error": None
-        }), 200
-        
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while fetching listing (encoding error)"
-        
-        import traceback
-        traceback.print_exc()
-        
-        return jsonify({
-            "error": f"An error occurred while fetching listing: {error_msg}",
+        with open(resolve_listing_json_path(sku=sku), 'rb') as f:
+            st = os.fstat(f.fileno())
+            etag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+            if request.if_none_match.contains(etag):
+                return _not_modified(etag)
+            listing_bytes = f.read().strip()
+    except OSError:
+        listing_bytes = b""
+    
+    if not listing_bytes:
+        return _json({
+            "error": f"Listing not found for SKU: {sku}",
+            "listing_data": None
+        }, status=404)
+    
+    # Listing files are written atomically, so a cheap framing check is enough to keep
+    # a truncated or non-object file from being spliced into a 200 as broken JSON
+    if not (listing_bytes.startswith(b"{") and listing_bytes.endswith(b"}")):
+        log.error("Listing file for SKU %s is not a JSON object", sku)
+        return _json({
+            "error": f"Listing file for SKU {sku} is corrupt",
             "listing_data": None
-        }), 500
+        }, status=500)
+    
+    log.info("Successfully loaded listing data for SKU: %s", sku)
+    
+    resp = Response(b'{"listing_data":' + listing_bytes + b',"error":null}', status=200, mimetype='application/json')
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'no-cache'
+    return resp
 
 @app.route('/api/upload-listing', methods=['POST'])
-def upload_listing():
+@json_body(required_keys=("sku",), stream=True)
+def upload_listing(data):
     """
     Upload a listing to eBay using upload_complete_listing.
     Streams real-time progress events as NDJSON so the frontend can show accurate status.
     """
-    # Parse request body before streaming
-    data = request.get_json()
-
+    # Body is parsed by json_body before streaming
     def generate():
         try:
-            print("[API] /api/upload-listing endpoint called")
-
-            if not data:
-                yield error_event("Request body must be JSON")
-                return
+            log.debug("/api/upload-listing endpoint called")
 
             sku = data.get("sku")
             filename = data.get("filename")
@@ -1575,9 +1723,9 @@ def upload_listing():
                 yield error_event("sku must be a non-empty string")
                 return
 
-            print(f"[API] Uploading listing to eBay with SKU: {sku}")
+            log.info("Uploading listing to eBay with SKU: %s", sku)
             if filename:
-                print(f"[API] Using filename: {filename}")
+                log.debug("Using filename: %s", filename)
 
             # Step 1: Preparing listing data
             yield progress_event('Preparing listing data', 'in_progress')
@@ -1588,7 +1736,7 @@ def upload_listing():
                 listing_data = load_listing_data(sku=sku)
 
             if not listing_data:
-                print(f"[API] First attempt failed, trying SKU as filename: {sku}.json")
+                log.warning("First attempt failed, trying SKU as filename: %s.json", sku)
                 listing_data = load_listing_data(filename=f"{sku}.json")
 
             if not listing_data:
@@ -1613,45 +1761,41 @@ def upload_listing():
 
             actual_sku = listing_data.get("sku", sku)
 
-            print(f"[API] Calling upload_complete_listing for SKU: {actual_sku}")
-            print(f"[API] Title: {product.get('title', 'N/A')}")
-            print(f"[API] Image count: {len(product.get('imageUrls', []))}")
-            print(f"[API] Price: {offer_data.get('pricingSummary', {}).get('price', {}).get('value', 'N/A')}")
+            log.info("Calling upload_complete_listing for SKU: %s", actual_sku)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    "Title: %s | Image count: %s | Price: %s",
+                    product.get('title', 'N/A'),
+                    len(product.get('imageUrls', [])),
+                    offer_data.get('pricingSummary', {}).get('price', {}).get('value', 'N/A'),
+                )
 
             yield progress_event('Preparing listing data', 'completed')
 
             # Step 2: Uploading to eBay
             yield progress_event('Uploading to eBay', 'in_progress')
 
-            try:
-                upload_result = upload_complete_listing(
-                    sku=actual_sku,
-                    inventory_item_data=inventory_item_data,
-                    offer_data=offer_data,
-                    locale="en-US",
-                    use_user_token=True
-                )
-            except Exception as upload_exception:
-                error_msg = str(upload_exception)
-                print(f"[API] Exception during upload_complete_listing: {error_msg}")
-                import traceback
-                traceback.print_exc()
-                yield error_event(f"Exception during upload: {error_msg}")
-                return
+            upload_result = upload_complete_listing(
+                sku=actual_sku,
+                inventory_item_data=inventory_item_data,
+                offer_data=offer_data,
+                locale="en-US",
+                use_user_token=True
+            )
 
             if not upload_result:
-                print(f"[API] upload_complete_listing returned None - upload failed")
+                log.warning("upload_complete_listing returned None - upload failed")
                 yield error_event("Failed to upload listing to eBay. Check server logs for details.")
                 return
 
-            print(f"[API] Successfully uploaded listing to eBay")
-            print(f"[API] Upload result: {upload_result}")
+            log.info("Successfully uploaded listing to eBay")
+            log.debug("Upload result: %s", upload_result)
 
             lid = upload_result.get("listingId")
             if lid:
                 save_ebay_listing_id(sku=sku, filename=filename, ebay_listing_id=lid)
             else:
-                print("[API] Warning: publish succeeded but listingId missing; ebayListingId not saved to JSON")
+                log.warning("publish succeeded but listingId missing; ebayListingId not saved to JSON")
 
             yield progress_event('Uploading to eBay', 'completed')
 
@@ -1661,15 +1805,8 @@ def upload_listing():
             })
 
         except Exception as e:
-            try:
-                error_msg = str(e)
-            except UnicodeEncodeError:
-                error_msg = "An error occurred while uploading listing (encoding error)"
-
-            import traceback
-            traceback.print_exc()
-
-            yield error_event(f"An error occurred while uploading listing: {error_msg}")
+            log.exception("Error uploading listing")
+            yield error_event(f"An error occurred while uploading listing: {e}")
 
     return streaming_response(generate())
 
@@ -1687,7 +1824,7 @@ def _test_application_token():
     }
     params = {'q': 'test', 'limit': 1}
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=15)
+        r = http_session.get(url, headers=headers, params=params, timeout=15)
         if r.status_code == 200:
             return {'ok': True, 'message': 'Application token is valid'}
         return {'ok': False, 'message': f'eBay API returned {r.status_code}: {r.text[:200]}'}
@@ -1707,7 +1844,7 @@ def _test_user_token():
     }
     params = {'limit': 1}
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=15)
+        r = http_session.get(url, headers=headers, params=params, timeout=15)
         if r.status_code == 200:
             return {'ok': True, 'message': 'User token is valid'}
         return {'ok': False, 'message': f'eBay API returned {r.status_code}: {r.text[:200]}'}
@@ -1716,23 +1853,19 @@ def _test_user_token():
 
 
 @app.route('/api/test-application-token', methods=['POST'])
+@api_error_handler(result=None)
 def api_test_application_token():
     """Test the application token via a simple Browse API call."""
-    try:
-        result = _test_application_token()
-        return jsonify({'result': result, 'error': None}), 200
-    except Exception as e:
-        return jsonify({'result': None, 'error': str(e)}), 500
+    result = _test_application_token()
+    return _json({'result': result, 'error': None})
 
 
 @app.route('/api/test-user-token', methods=['POST'])
+@api_error_handler(result=None)
 def api_test_user_token():
     """Test the user token via a simple Inventory API call."""
-    try:
-        result = _test_user_token()
-        return jsonify({'result': result, 'error': None}), 200
-    except Exception as e:
-        return jsonify({'result': None, 'error': str(e)}), 500
+    result = _test_user_token()
+    return _json({'result': result, 'error': None})
 
 
 @app.route('/api/listings/quantities', methods=['POST'])
@@ -1746,11 +1879,11 @@ def api_listings_quantities():
     body = request.get_json(silent=True) or {}
     skus = body.get('skus', [])
     if not skus:
-        return jsonify({}), 200
+        return _json({})
 
     token = os.getenv('user_token', '').strip()
     if not token:
-        return jsonify({sku: None for sku in skus}), 200
+        return _json({sku: None for sku in skus})
 
     headers = {
         'Authorization': f'Bearer {token}',
@@ -1762,7 +1895,7 @@ def api_listings_quantities():
         try:
             # Try offer endpoint first (reflects live listing quantity)
             url = f'https://api.ebay.com/sell/inventory/v1/offer?sku={sku}'
-            r = requests.get(url, headers=headers, timeout=10)
+            r = http_session.get(url, headers=headers, timeout=10)
             qty = None
             if r.status_code == 200:
                 resp_data = r.json()
@@ -1773,12 +1906,12 @@ def api_listings_quantities():
                     if qty is None:
                         qty = offer.get('quantity')
                     if qty is None:
-                        print(f"[quantities] SKU {sku}: offer keys = {list(offer.keys())}")
+                        log.debug("[quantities] SKU %s: offer keys = %s", sku, list(offer.keys()))
 
             # Fall back to inventory item quantity if offer didn't provide one
             if qty is None:
                 inv_url = f'https://api.ebay.com/sell/inventory/v1/inventory_item/{sku}'
-                r2 = requests.get(inv_url, headers=headers, timeout=10)
+                r2 = http_session.get(inv_url, headers=headers, timeout=10)
                 if r2.status_code == 200:
                     qty = (
                         r2.json()
@@ -1789,19 +1922,17 @@ def api_listings_quantities():
 
             result[sku] = qty
         except Exception as e:
-            print(f"[quantities] SKU {sku}: exception {e}")
+            log.warning("[quantities] SKU %s: exception %s", sku, e)
             result[sku] = None
 
-    return jsonify(result), 200
+    return _json(result)
 
 
 @app.route('/api/settings/auto-restock', methods=['GET'])
+@api_error_handler()
 def api_get_auto_restock_settings():
     """Read the persisted auto-restock enabled flag and target quantity."""
-    try:
-        return jsonify(get_auto_restock_settings()), 200
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return _json(get_auto_restock_settings())
 
 
 @app.route('/api/settings/auto-restock', methods=['POST'])
@@ -1814,13 +1945,13 @@ def api_save_auto_restock_settings():
         if quantity is not None:
             quantity = int(quantity)
             if quantity < 0:
-                return jsonify({'error': 'quantity must be a non-negative integer'}), 400
+                return _json({'error': 'quantity must be a non-negative integer'}, status=400)
         settings = save_auto_restock_settings(enabled=enabled, quantity=quantity)
-        return jsonify(settings), 200
+        return _json(settings)
     except (TypeError, ValueError):
-        return jsonify({'error': 'quantity must be a non-negative integer'}), 400
+        return _json({'error': 'quantity must be a non-negative integer'}, status=400)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}, status=500)
 
 
 @app.route('/api/listings/restock', methods=['POST'])
@@ -1842,14 +1973,14 @@ def api_restock_listings():
         if quantity < 0:
             raise ValueError
     except (TypeError, ValueError):
-        return jsonify({'error': 'quantity must be a non-negative integer'}), 400
+        return _json({'error': 'quantity must be a non-negative integer'}, status=400)
 
     if not skus:
-        return jsonify({'updated': [], 'failed': [], 'quantity': quantity}), 200
+        return _json({'updated': [], 'failed': [], 'quantity': quantity})
 
     token = os.getenv('user_token', '').strip()
     if not token:
-        return jsonify({'updated': [], 'failed': skus, 'quantity': quantity, 'error': 'No user token available'}), 200
+        return _json({'updated': [], 'failed': skus, 'quantity': quantity, 'error': 'No user token available'})
 
     headers = {
         'Authorization': f'Bearer {token}',
@@ -1860,7 +1991,7 @@ def api_restock_listings():
     sku_offer_ids = {}
     for sku in skus:
         try:
-            r = requests.get(
+            r = http_session.get(
                 f'https://api.ebay.com/sell/inventory/v1/offer?sku={sku}',
                 headers=headers,
                 timeout=10,
@@ -1892,7 +2023,7 @@ def api_restock_listings():
 
         payload = {'requests': requests_list}
         try:
-            r = requests.post(
+            r = http_session.post(
                 'https://api.ebay.com/sell/inventory/v1/bulk_update_price_quantity',
                 headers=headers,
                 json=payload,
@@ -1915,11 +2046,13 @@ def api_restock_listings():
     for sku in updated:
         update_local_listing_quantity(sku=sku, quantity=quantity)
 
-    return jsonify({'updated': updated, 'failed': failed, 'quantity': quantity}), 200
+    return _json({'updated': updated, 'failed': failed, 'quantity': quantity})
 
 
 @app.route('/api/testing', methods=['POST'])
-def run_testing_function():
+@api_error_handler("An error occurred while running testing function", result=None)
+@json_body(allow_empty=True, result=None)
+def run_testing_function(data):
     """
     Run the testing_function from CopyListingMain.
     
@@ -1931,38 +2064,22 @@ def run_testing_function():
     Returns:
         JSON response with result or error message
     """
-    try:
-        print("[API] /api/testing endpoint called")
-        data = request.get_json() or {}
-        
-        id_param = data.get("id")
-        print(f"[API] Testing function called with id: {id_param}")
-        
-        # Call the testing function with id parameter
-        result = testing_function(id=id_param)
-        
-        print("[API] Testing function completed")
-        
-        return jsonify({
-            "result": result if result is not None else "Testing function executed successfully",
-            "error": None
-        }), 200
-        
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred while running testing function (encoding error)"
-        
-        import traceback
-        traceback.print_exc()
-        
-        return jsonify({
-            "error": f"An error occurred while running testing function: {error_msg}",
-            "result": None
-        }), 500
+    log.debug("/api/testing endpoint called")
+    id_param = data.get("id")
+    log.info("Testing function called with id: %s", id_param)
+    
+    # Call the testing function with id parameter
+    result = testing_function(id=id_param)
+    
+    log.info("Testing function completed")
+    
+    return _json({
+        "result": result if result is not None else "Testing function executed successfully",
+        "error": None
+    })
 
 @app.route('/api/remove-background', methods=['POST'])
+@api_error_handler("An error occurred during background removal")
 def api_remove_background():
     """
     Remove the background from an uploaded image using rembg.
@@ -1972,33 +2089,20 @@ def api_remove_background():
     Returns:
         PNG image with background removed (transparent).
     """
-    try:
-        file = request.files.get('image')
-        if not file:
-            return jsonify({"error": "No image file provided"}), 400
-
-        print(f"[API] /api/remove-background called with file: {file.filename}")
-        image_bytes = file.read()
-        result_bytes = remove_background(image_bytes)
-        print("[API] Background removal completed successfully")
-
-        return Response(result_bytes, mimetype='image/png')
-
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred during background removal (encoding error)"
+    file = request.files.get('image')
+    if not file:
+        return _json({"error": "No image file provided"}, status=400)
 
-        import traceback
-        traceback.print_exc()
+    log.info("/api/remove-background called with file: %s", file.filename)
+    image_bytes = file.read()
+    result_bytes = remove_background(image_bytes)
+    log.info("Background removal completed successfully")
 
-        return jsonify({
-            "error": f"An error occurred during background removal: {error_msg}"
-        }), 500
+    return Response(result_bytes, mimetype='image/png')
 
 
 @app.route('/api/upload-image', methods=['POST'])
+@api_error_handler("An error occurred during image upload")
 def api_upload_image():
     """
     Upload a PNG/JPEG image to eBay Picture Services.
@@ -2008,42 +2112,37 @@ def api_upload_image():
     Returns:
         JSON with the eBay-hosted image URL.
     """
-    try:
-        file = request.files.get('image')
-        if not file:
-            return jsonify({"error": "No image file provided"}), 400
-
-        print(f"[API] /api/upload-image called with file: {file.filename}")
-        image_bytes = file.read()
-
-        if not image_bytes:
-            return jsonify({"error": "Empty image file"}), 400
-
-        import base64
-        import requests as http_requests
-        import xml.etree.ElementTree as ET
-
-        user_token = os.getenv('user_token')
-        if not user_token:
-            return jsonify({"error": "eBay user token not configured"}), 500
-
-        # Determine content type
-        content_type = file.content_type or 'image/png'
-        if 'jpeg' in content_type or 'jpg' in content_type:
-            file_ext = '.jpg'
-        elif 'png' in content_type:
-            file_ext = '.png'
-        elif 'webp' in content_type:
-            file_ext = '.webp'
-        else:
-            file_ext = '.png'
-            content_type = 'image/png'
+    file = request.files.get('image')
+    if not file:
+        return _json({"error": "No image file provided"}, status=400)
+
+    log.info("/api/upload-image called with file: %s", file.filename)
+    image_bytes = file.read()
+
+    if not image_bytes:
+        return _json({"error": "Empty image file"}, status=400)
+
+    user_token = os.getenv('user_token')
+    if not user_token:
+        return _json({"error": "eBay user token not configured"}, status=500)
+
+    # Determine content type
+    content_type = file.content_type or 'image/png'
+    if 'jpeg' in content_type or 'jpg' in content_type:
+        file_ext = '.jpg'
+    elif 'png' in content_type:
+        file_ext = '.png'
+    elif 'webp' in content_type:
+        file_ext = '.webp'
+    else:
+        file_ext = '.png'
+        content_type = 'image/png'
 
-        safe_filename = f"canvas_image{file_ext}"
-        picture_name = "Canvas Compiled Image"
+    safe_filename = f"canvas_image{file_ext}"
+    picture_name = "Canvas Compiled Image"
 
-        # Build eBay UploadSiteHostedPictures XML
-        xml_payload = f"""<?xml version="1.0" encoding="utf-8"?>
+    # Build eBay UploadSiteHostedPictures XML
+    xml_payload = f"""<?xml version="1.0" encoding="utf-8"?>
 <UploadSiteHostedPicturesRequest xmlns="urn:ebay:apis:eBLBaseComponents">
     <RequesterCredentials>
         <eBayAuthToken>{user_token}</eBayAuthToken>
@@ -2052,85 +2151,73 @@ def api_upload_image():
     <PictureSet>Standard</PictureSet>
 </UploadSiteHostedPicturesRequest>"""
 
-        headers = {
-            "X-EBAY-API-SITEID": "0",
-            "X-EBAY-API-COMPATIBILITY-LEVEL": "967",
-            "X-EBAY-API-CALL-NAME": "UploadSiteHostedPictures",
-            "X-EBAY-API-RESPONSE-ENCODING": "XML"
-        }
-
-        url = "https://api.ebay.com/ws/api.dll"
-
-        # Construct multipart/form-data
-        boundary = f"----FormBoundary{uuid.uuid4().hex[:16]}"
-        body_parts = []
-
-        # XML Payload part
-        body_parts.append(f"--{boundary}\r\n".encode('utf-8'))
-        body_parts.append(f'Content-Disposition: form-data; name="XML Payload"\r\n'.encode('utf-8'))
-        body_parts.append(f'\r\n'.encode('utf-8'))
-        body_parts.append(xml_payload.encode('utf-8'))
-        body_parts.append(f'\r\n'.encode('utf-8'))
-
-        # Binary image part
-        body_parts.append(f"--{boundary}\r\n".encode('utf-8'))
-        body_parts.append(f'Content-Disposition: form-data; name="{picture_name}"; filename="{safe_filename}"\r\n'.encode('utf-8'))
-        body_parts.append(f'Content-Type: {content_type}\r\n'.encode('utf-8'))
-        body_parts.append(f'\r\n'.encode('utf-8'))
-        body_parts.append(image_bytes)
-        body_parts.append(f'\r\n'.encode('utf-8'))
-
-        # Closing boundary
-        body_parts.append(f"--{boundary}--\r\n".encode('utf-8'))
-
-        multipart_body = b''.join(body_parts)
-        headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
-
-        print(f"[API] Uploading {len(image_bytes)} bytes to eBay Picture Services...")
-        resp = http_requests.post(url, data=multipart_body, headers=headers, timeout=60)
-
-        if resp.status_code != 200:
-            print(f"[API] eBay upload HTTP error: {resp.status_code}")
-            return jsonify({"error": f"eBay upload failed with status {resp.status_code}"}), 502
-
-        # Parse XML response
-        root = ET.fromstring(resp.content)
-        ack = root.find(".//{urn:ebay:apis:eBLBaseComponents}Ack")
-        if ack is not None and ack.text != "Success":
-            errors = root.findall(".//{urn:ebay:apis:eBLBaseComponents}Errors")
-            error_msgs = []
-            for error in errors:
-                short_msg = error.find(".//{urn:ebay:apis:eBLBaseComponents}ShortMessage")
-                if short_msg is not None:
-                    error_msgs.append(short_msg.text)
-            error_str = "; ".join(error_msgs) if error_msgs else "Unknown eBay error"
-            print(f"[API] eBay upload error: {error_str}")
-            return jsonify({"error": f"eBay upload failed: {error_str}"}), 502
-
-        full_url_elem = root.find(".//{urn:ebay:apis:eBLBaseComponents}FullURL")
-        if full_url_elem is not None and full_url_elem.text:
-            ebay_url = full_url_elem.text
-            print(f"[API] Image uploaded successfully: {ebay_url}")
-            return jsonify({"url": ebay_url}), 200
-        else:
-            print("[API] Could not find FullURL in eBay response")
-            return jsonify({"error": "eBay upload succeeded but no URL returned"}), 502
-
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred during image upload (encoding error)"
-
-        import traceback
-        traceback.print_exc()
+    headers = {
+        "X-EBAY-API-SITEID": "0",
+        "X-EBAY-API-COMPATIBILITY-LEVEL": "967",
+        "X-EBAY-API-CALL-NAME": "UploadSiteHostedPictures",
+        "X-EBAY-API-RESPONSE-ENCODING": "XML"
+    }
 
-        return jsonify({
-            "error": f"An error occurred during image upload: {error_msg}"
-        }), 500
+    url = "https://api.ebay.com/ws/api.dll"
+
+    # Construct multipart/form-data
+    boundary = f"----FormBoundary{uuid.uuid4().hex[:16]}"
+    body_parts = []
+
+    # XML Payload part
+    body_parts.append(f"--{boundary}\r\n".encode('utf-8'))
+    body_parts.append(f'Content-Disposition: form-data; name="XML Payload"\r\n'.encode('utf-8'))
+    body_parts.append(f'\r\n'.encode('utf-8'))
+    body_parts.append(xml_payload.encode('utf-8'))
+    body_parts.append(f'\r\n'.encode('utf-8'))
+
+    # Binary image part
+    body_parts.append(f"--{boundary}\r\n".encode('utf-8'))
+    body_parts.append(f'Content-Disposition: form-data; name="{picture_name}"; filename="{safe_filename}"\r\n'.encode('utf-8'))
+    body_parts.append(f'Content-Type: {content_type}\r\n'.encode('utf-8'))
+    body_parts.append(f'\r\n'.encode('utf-8'))
+    body_parts.append(image_bytes)
+    body_parts.append(f'\r\n'.encode('utf-8'))
+
+    # Closing boundary
+    body_parts.append(f"--{boundary}--\r\n".encode('utf-8'))
+
+    multipart_body = b''.join(body_parts)
+    headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+
+    log.info("Uploading %s bytes to eBay Picture Services...", len(image_bytes))
+    resp = http_session.post(url, data=multipart_body, headers=headers, timeout=60)
+
+    if resp.status_code != 200:
+        log.error("eBay upload HTTP error: %s", resp.status_code)
+        return _json({"error": f"eBay upload failed with status {resp.status_code}"}, status=502)
+
+    # Parse XML response
+    root = ET.fromstring(resp.content)
+    ack = root.find(".//{urn:ebay:apis:eBLBaseComponents}Ack")
+    if ack is not None and ack.text != "Success":
+        errors = root.findall(".//{urn:ebay:apis:eBLBaseComponents}Errors")
+        error_msgs = []
+        for error in errors:
+            short_msg = error.find(".//{urn:ebay:apis:eBLBaseComponents}ShortMessage")
+            if short_msg is not None:
+                error_msgs.append(short_msg.text)
+        error_str = "; ".join(error_msgs) if error_msgs else "Unknown eBay error"
+        log.error("eBay upload error: %s", error_str)
+        return _json({"error": f"eBay upload failed: {error_str}"}, status=502)
+
+    full_url_elem = root.find(".//{urn:ebay:apis:eBLBaseComponents}FullURL")
+    if full_url_elem is not None and full_url_elem.text:
+        ebay_url = full_url_elem.text
+        log.info("Image uploaded successfully: %s", ebay_url)
+        return _json({"url": ebay_url})
+    else:
+        log.warning("Could not find FullURL in eBay response")
+        return _json({"error": "eBay upload succeeded but no URL returned"}, status=502)
 
 
 @app.route('/api/compile-canvas', methods=['POST'])
+@api_error_handler("An error occurred during canvas compilation")
 def api_compile_canvas():
     """
     Compile multiple images onto a canvas with transforms.
@@ -2155,52 +2242,37 @@ def api_compile_canvas():
     Returns:
         PNG image of the composed canvas.
     """
-    try:
-        data = request.get_json()
-        if not data or 'layers' not in data:
-            return jsonify({"error": "No layers provided"}), 400
-
-        print(f"[API] /api/compile-canvas called with {len(data['layers'])} layers")
-
-        layers = data['layers']
-        canvas_width = data.get('canvasWidth', 1080)
-        canvas_height = data.get('canvasHeight', 1080)
-        bg_color = data.get('bgColor', '#FFFFFF')
-
-        result_bytes = compile_images(
-            layers=layers,
-            canvas_width=canvas_width,
-            canvas_height=canvas_height,
-            bg_color=bg_color
-        )
+    data = request.get_json()
+    if not data or 'layers' not in data:
+        return _json({"error": "No layers provided"}, status=400)
 
-        print("[API] Canvas compilation completed successfully")
-        return Response(result_bytes, mimetype='image/png')
+    log.info("/api/compile-canvas called with %s layers", len(data['layers']))
 
-    except Exception as e:
-        try:
-            error_msg = str(e)
-        except UnicodeEncodeError:
-            error_msg = "An error occurred during canvas compilation (encoding error)"
+    layers = data['layers']
+    canvas_width = data.get('canvasWidth', 1080)
+    canvas_height = data.get('canvasHeight', 1080)
+    bg_color = data.get('bgColor', '#FFFFFF')
 
-        import traceback
-        traceback.print_exc()
+    result_bytes = compile_images(
+        layers=layers,
+        canvas_width=canvas_width,
+        canvas_height=canvas_height,
+        bg_color=bg_color
+    )
 
-        return jsonify({
-            "error": f"An error occurred during canvas compilation: {error_msg}"
-        }), 500
+    log.info("Canvas compilation completed successfully")
+    return Response(result_bytes, mimetype='image/png')
 
 
 @app.route('/api/tokens', methods=['GET'])
 def get_tokens():
     """Get current token values (masked) from the .env file"""
-    env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
     tokens = {'user_token': '', 'application_token': ''}
     token_last_updated_ms = None
 
     try:
-        token_last_updated_ms = int(os.path.getmtime(env_path) * 1000)
-        with open(env_path, 'r', encoding='utf-8') as f:
+        token_last_updated_ms = int(os.path.getmtime(ENV_PATH) * 1000)
+        with open(ENV_PATH, 'r', encoding='utf-8') as f:
             for line in f:
                 stripped = line.strip()
                 if stripped.startswith('user_token='):
@@ -2208,7 +2280,7 @@ def get_tokens():
                 elif stripped.startswith('application_token='):
                     tokens['application_token'] = stripped[len('application_token='):]
     except Exception as e:
-        return jsonify({"error": f"Failed to read .env: {str(e)}"}), 500
+        return _json({"error": f"Failed to read .env: {str(e)}"}, status=500)
 
     def mask(val):
         if not val:
@@ -2217,7 +2289,7 @@ def get_tokens():
             return val[:15] + '...' + val[-15:]
         return val
 
-    return jsonify({
+    return _json({
         'user_token': mask(tokens['user_token']),
         'application_token': mask(tokens['application_token']),
         'user_token_set': bool(tokens['user_token']),
@@ -2229,84 +2301,79 @@ def get_tokens():
 
 
 @app.route('/api/update-tokens', methods=['POST'])
+@api_error_handler("Failed to update tokens")
 def update_tokens():
     """
     Update user_token and/or application_token in the .env file.
     Handles values with special characters like ^ # = etc.
     Writes values unquoted to avoid shell-escaping issues.
     """
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
+    data = request.get_json()
+    if not data:
+        return _json({"error": "No data provided"}, status=400)
 
-        user_token = data.get('user_token', '').strip()
-        application_token = data.get('application_token', '').strip()
+    user_token = data.get('user_token', '').strip()
+    application_token = data.get('application_token', '').strip()
 
-        if not user_token and not application_token:
-            return jsonify({"error": "At least one token must be provided"}), 400
+    if not user_token and not application_token:
+        return _json({"error": "At least one token must be provided"}, status=400)
 
-        env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
 
-        # Read current .env file preserving exact content
-        with open(env_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+    # Read current .env file preserving exact content
+    with open(ENV_PATH, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
 
-        new_lines = []
-        user_token_found = False
-        app_token_found = False
-
-        for line in lines:
-            stripped = line.strip()
-            if user_token and stripped.startswith('user_token='):
-                new_lines.append(f'user_token={user_token}\n')
-                user_token_found = True
-            elif application_token and stripped.startswith('application_token='):
-                new_lines.append(f'application_token={application_token}\n')
-                app_token_found = True
-            else:
-                new_lines.append(line)
+    new_lines = []
+    user_token_found = False
+    app_token_found = False
 
-        # Append tokens that weren't found in the file
-        if user_token and not user_token_found:
-            if new_lines and not new_lines[-1].endswith('\n'):
-                new_lines.append('\n')
+    for line in lines:
+        stripped = line.strip()
+        if user_token and stripped.startswith('user_token='):
             new_lines.append(f'user_token={user_token}\n')
-        if application_token and not app_token_found:
-            if new_lines and not new_lines[-1].endswith('\n'):
-                new_lines.append('\n')
+            user_token_found = True
+        elif application_token and stripped.startswith('application_token='):
             new_lines.append(f'application_token={application_token}\n')
+            app_token_found = True
+        else:
+            new_lines.append(line)
+
+    # Append tokens that weren't found in the file
+    if user_token and not user_token_found:
+        if new_lines and not new_lines[-1].endswith('\n'):
+            new_lines.append('\n')
+        new_lines.append(f'user_token={user_token}\n')
+    if application_token and not app_token_found:
+        if new_lines and not new_lines[-1].endswith('\n'):
+            new_lines.append('\n')
+        new_lines.append(f'application_token={application_token}\n')
+
+    # Write back the file
+    with open(ENV_PATH, 'w', encoding='utf-8') as f:
+        f.writelines(new_lines)
+
+    log.info(
+        "Tokens updated in .env - user_token: %s, application_token: %s",
+        'yes' if user_token else 'no',
+        'yes' if application_token else 'no',
+    )
 
-        # Write back the file
-        with open(env_path, 'w', encoding='utf-8') as f:
-            f.writelines(new_lines)
-
-        print(f"[API] Tokens updated in .env - user_token: {'yes' if user_token else 'no'}, application_token: {'yes' if application_token else 'no'}")
-
-        return jsonify({
-            "success": True,
-            "message": "Tokens updated successfully",
-            "user_token_updated": bool(user_token),
-            "application_token_updated": bool(application_token)
-        })
-
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": f"Failed to update tokens: {str(e)}"}), 500
+    return _json({
+        "success": True,
+        "message": "Tokens updated successfully",
+        "user_token_updated": bool(user_token),
+        "application_token_updated": bool(application_token)
+    })
 
 
 @app.route('/api/refresh-tokens', methods=['POST'])
+@api_error_handler()
 def api_refresh_tokens():
     """Refresh both user and application tokens via OAuth."""
-    try:
-        from backend.refreshToken import refresh_user_and_app_token
-        result = refresh_user_and_app_token()
-        env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
-        load_dotenv(env_path, override=True)
-        return jsonify(result), 200
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    from backend.refreshToken import refresh_user_and_app_token
+    result = refresh_user_and_app_token()
+    load_dotenv(ENV_PATH, override=True)
+    return _json(result)
 
 
 _API_KEY_NAMES = ('openrouter_api_key', 'bedrock_api_key')
@@ -2323,11 +2390,10 @@ def _mask_secret(val):
 @app.route('/api/api-keys', methods=['GET'])
 def get_api_keys():
     """Get current API key values (masked) from the .env file."""
-    env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
     values = {name: '' for name in _API_KEY_NAMES}
 
     try:
-        with open(env_path, 'r', encoding='utf-8') as f:
+        with open(ENV_PATH, 'r', encoding='utf-8') as f:
             for line in f:
                 stripped = line.strip()
                 for name in _API_KEY_NAMES:
@@ -2338,105 +2404,95 @@ def get_api_keys():
     except FileNotFoundError:
         pass
     except Exception as e:
-        return jsonify({"error": f"Failed to read .env: {str(e)}"}), 500
+        return _json({"error": f"Failed to read .env: {str(e)}"}, status=500)
 
     response = {}
     for name in _API_KEY_NAMES:
         response[name] = _mask_secret(values[name])
         response[f'{name}_set'] = bool(values[name])
-    return jsonify(response)
+    return _json(response)
 
 
 @app.route('/api/api-keys', methods=['POST'])
+@api_error_handler("Failed to update API keys")
 def update_api_keys():
     """
     Update openrouter_api_key and/or bedrock_api_key in the .env file.
     Writes values unquoted to preserve any special characters.
     """
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
+    data = request.get_json()
+    if not data:
+        return _json({"error": "No data provided"}, status=400)
 
-        updates = {}
-        for name in _API_KEY_NAMES:
-            raw = data.get(name)
-            if raw is None:
-                continue
-            value = str(raw).strip()
-            if value:
-                updates[name] = value
+    updates = {}
+    for name in _API_KEY_NAMES:
+        raw = data.get(name)
+        if raw is None:
+            continue
+        value = str(raw).strip()
+        if value:
+            updates[name] = value
 
-        if not updates:
-            return jsonify({"error": "At least one API key must be provided"}), 400
+    if not updates:
+        return _json({"error": "At least one API key must be provided"}, status=400)
 
-        env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
 
-        try:
-            with open(env_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        except FileNotFoundError:
-            lines = []
-
-        new_lines = []
-        found = {name: False for name in updates}
-        for line in lines:
-            stripped = line.strip()
-            replaced = False
-            for name, value in updates.items():
-                if stripped.startswith(name + '='):
-                    new_lines.append(f'{name}={value}\n')
-                    found[name] = True
-                    replaced = True
-                    break
-            if not replaced:
-                new_lines.append(line)
-
-        for name, was_found in found.items():
-            if not was_found:
-                if new_lines and not new_lines[-1].endswith('\n'):
-                    new_lines.append('\n')
-                new_lines.append(f'{name}={updates[name]}\n')
-
-        with open(env_path, 'w', encoding='utf-8') as f:
-            f.writelines(new_lines)
-
-        load_dotenv(env_path, override=True)
-
-        # ebay_cli caches openrouter_api_key at import time and mirrors
-        # bedrock_api_key into AWS_BEARER_TOKEN_BEDROCK for boto3; refresh
-        # both so new keys take effect without a server restart.
-        try:
-            import backend.ebay_cli as ebay_cli
-            if 'openrouter_api_key' in updates:
-                ebay_cli.OPENROUTER_API_KEY = os.getenv('openrouter_api_key')
-            if 'bedrock_api_key' in updates:
-                ebay_cli._sync_bedrock_bearer_token()
-        except Exception:
-            pass
+    try:
+        with open(ENV_PATH, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        lines = []
+
+    new_lines = []
+    found = {name: False for name in updates}
+    for line in lines:
+        stripped = line.strip()
+        replaced = False
+        for name, value in updates.items():
+            if stripped.startswith(name + '='):
+                new_lines.append(f'{name}={value}\n')
+                found[name] = True
+                replaced = True
+                break
+        if not replaced:
+            new_lines.append(line)
 
-        print(
-            "[API] API keys updated in .env - "
-            + ", ".join(f"{name}: yes" for name in updates)
-        )
+    for name, was_found in found.items():
+        if not was_found:
+            if new_lines and not new_lines[-1].endswith('\n'):
+                new_lines.append('\n')
+            new_lines.append(f'{name}={updates[name]}\n')
 
-        result = {"success": True, "message": "API keys updated successfully"}
-        for name in _API_KEY_NAMES:
-            result[f'{name}_updated'] = name in updates
-        return jsonify(result)
+    with open(ENV_PATH, 'w', encoding='utf-8') as f:
+        f.writelines(new_lines)
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": f"Failed to update API keys: {str(e)}"}), 500
+    load_dotenv(ENV_PATH, override=True)
+
+    # ebay_cli caches openrouter_api_key at import time and mirrors
+    # bedrock_api_key into AWS_BEARER_TOKEN_BEDROCK for boto3; refresh
+    # both so new keys take effect without a server restart.
+    try:
+        import backend.ebay_cli as ebay_cli
+        if 'openrouter_api_key' in updates:
+            ebay_cli.OPENROUTER_API_KEY = os.getenv('openrouter_api_key')
+        if 'bedrock_api_key' in updates:
+            ebay_cli._sync_bedrock_bearer_token()
+    except Exception:
+        pass
+
+    log.info("API keys updated in .env - %s", ", ".join(f"{name}: yes" for name in updates))
+
+    result = {"success": True, "message": "API keys updated successfully"}
+    for name in _API_KEY_NAMES:
+        result[f'{name}_updated'] = name in updates
+    return _json(result)
 
 
 @app.route('/api/text-models', methods=['GET'])
 def get_text_models():
     """Return the text models the user can actually call right now,
     gated by which provider API keys are set in the .env file."""
-    from backend.text_models import get_available_text_models
-    return jsonify({"models": get_available_text_models()})
+    return _json({"models": get_available_text_models()})
 
 
 def _test_text_model_result(payload=None, error=None, log_lines=None):
@@ -2449,21 +2505,19 @@ def _test_text_model_result(payload=None, error=None, log_lines=None):
 
 
 def _test_text_model(prompt, model):
-    from backend.text_models import is_bedrock_model, is_openrouter_model
-
-    log = []
+    lines = []
 
     def add(line):
-        log.append(line)
-        print(line)
+        lines.append(line)
+        log.info("%s", line)
 
     def fail(message):
-        return _test_text_model_result(error=message, log_lines=log)
+        return _test_text_model_result(error=message, log_lines=lines)
 
     def ok(content):
         return _test_text_model_result(
             payload={'content': content.strip()},
-            log_lines=log,
+            log_lines=lines,
         )
 
     if is_bedrock_model(model):
@@ -2505,7 +2559,6 @@ def _test_text_model(prompt, model):
             return fail('boto3 is not installed.')
         except Exception as e:
             add(f'Error calling Bedrock API: {e}')
-            import traceback
             add(traceback.format_exc().strip())
             return fail('No response from the text model.')
 
@@ -2526,7 +2579,7 @@ def _test_text_model(prompt, model):
 
     add(f'Calling OpenRouter model: {model}')
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=60)
+        response = http_session.post(url, headers=headers, json=data, timeout=60)
         add(f'HTTP {response.status_code}')
         body_preview = (response.text or '')[:4000]
         if body_preview:
@@ -2548,14 +2601,11 @@ def _test_text_model(prompt, model):
         return fail('No response from the text model.')
     except Exception as e:
         add(f'Unexpected error: {e}')
-        import traceback
         add(traceback.format_exc().strip())
         return fail('No response from the text model.')
 
 
 def _test_image_model(prompt, model):
-    import base64
-
     if model.startswith('stability.'):
         if not os.getenv('bedrock_api_key'):
             return None, 'Bedrock API key is not set. Add bedrock_api_key in Settings.'
@@ -2581,7 +2631,7 @@ def _test_image_model(prompt, model):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=120)
+        response = http_session.post(url, headers=headers, json=data, timeout=120)
         response.raise_for_status()
         result = response.json()
     except requests.exceptions.RequestException as e:
@@ -2621,50 +2671,51 @@ def _test_image_model(prompt, model):
 
 
 @app.route('/api/test-ai-model', methods=['POST'])
+@api_error_handler()
 def api_test_ai_model():
     """
     Quick connectivity test for text or image generation models via OpenRouter.
 
     JSON body: { "kind": "text"|"image", "model": "...", "prompt": "..." }
     """
-    try:
-        data = request.get_json() or {}
-        kind = (data.get('kind') or 'text').strip().lower()
-        model = (data.get('model') or '').strip()
-        prompt = (data.get('prompt') or '').strip()
-
-        if kind not in ('text', 'image'):
-            return jsonify({'error': 'kind must be "text" or "image"'}), 400
-        if not model:
-            return jsonify({'error': 'model is required'}), 400
-        if not prompt:
-            return jsonify({'error': 'prompt is required'}), 400
-
-        server_log = None
-        if kind == 'text':
-            text_result = _test_text_model(prompt, model)
-            payload = text_result['payload']
-            err = text_result['error']
-            server_log = text_result['server_log']
-        else:
-            payload, err = _test_image_model(prompt, model)
-
-        if err:
-            body = {'error': err}
-            if server_log:
-                body['server_log'] = server_log
-            return jsonify(body), 502
-        return jsonify({'error': None, **payload}), 200
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+    data = request.get_json() or {}
+    kind = (data.get('kind') or 'text').strip().lower()
+    model = (data.get('model') or '').strip()
+    prompt = (data.get('prompt') or '').strip()
+
+    if kind not in ('text', 'image'):
+        return _json({'error': 'kind must be "text" or "image"'}, status=400)
+    if not model:
+        return _json({'error': 'model is required'}, status=400)
+    if not prompt:
+        return _json({'error': 'prompt is required'}, status=400)
+
+    server_log = None
+    if kind == 'text':
+        text_result = _test_text_model(prompt, model)
+        payload = text_result['payload']
+        err = text_result['error']
+        server_log = text_result['server_log']
+    else:
+        payload, err = _test_image_model(prompt, model)
+
+    if err:
+        body = {'error': err}
+        if server_log:
+            body['server_log'] = server_log
+        return _json(body, status=502)
+    return _json({'error': None, **payload})
+
 
+# Health body never changes; encode it once. A fresh Response per hit is still
+# needed since after_request hooks mutate response headers.
+_HEALTH_BODY = orjson.dumps({"status": "ok"})
 
-@app.route('/api/health', methods=['GET'])
+
+@app.route('/api/health', methods=['GET'], provide_automatic_options=False)
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "ok"}), 200
+    return Response(_HEALTH_BODY, status=200, mimetype='application/json', headers={'Cache-Control': 'no-store'})
 
 
 class _QuietTokensRequestHandler(WSGIRequestHandler):
@@ -2677,5 +2728,30 @@ class _QuietTokensRequestHandler(WSGIRequestHandler):
         super().log_request(code, size)
 
 
+
+def _assert_unique_routes():
+    """Fail fast if two handlers register the same rule+method (Flask would silently shadow one)."""
+    seen = {}
+    for rule in app.url_map.iter_rules():
+        for method in rule.methods - {'HEAD', 'OPTIONS'}:
+            key = (rule.rule, method)
+            if key in seen:
+                raise RuntimeError(f"Duplicate route {method} {rule.rule}: {seen[key]} and {rule.endpoint}")
+            seen[key] = rule.endpoint
+
+
+_assert_unique_routes()
+
+
 if __name__ == '__main__':
-    app.run(debug=True, use_reloader=False, port=5000, request_handler=_QuietTokensRequestHandler)
+    # threaded=True so a slow eBay/OpenRouter call doesn't block other requests.
+    # For a non-dev server on POSIX: gunicorn -k gthread -w 1 --threads 16 app:app
+    # (single worker unless REDIS_URL is set: image_generation_tasks and the listing cache are process-local).
+    # Debugger is opt-in (FLASK_DEBUG=1); it adds traceback capture and the PIN console to every request.
+    app.run(
+        debug=os.environ.get('FLASK_DEBUG') == '1',
+        use_reloader=False,
+        port=int(os.environ.get('PORT', 5000)),
+        threaded=True,
+        request_handler=_QuietTokensRequestHandler,
+    )
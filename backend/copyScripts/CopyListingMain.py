@@ -5,11 +5,21 @@ This module orchestrates the process of fetching eBay listing data
 and generating optimized text content.
 """
 
+import re
+
 from backend.helper_functions import remove_html_tags
 from backend.copyScripts.create_text import create_text
 from backend.copyScripts.combine_data import create_listing_with_preferences, update_listing_title_description, update_listing_meta_data,update_listing_with_aspects
 from backend.copyScripts.create_image import generate_image_from_urls, ImageType, categorize_images
 
+# Item id segment of an eBay listing URL: /itm/<id> or /itm/<slug>/<id>
+_ITM_RE = re.compile(r'/itm/(?:[^/?#]+/)?([^/?#]+)')
+
+
+def _item_id_from(id):
+    """Return the item id from an eBay listing URL, or id unchanged if it isn't one."""
+    match = _ITM_RE.search(id)
+    return match.group(1) if match else id
 
 
 def copy_listing_main(id):
@@ -26,8 +36,7 @@ def copy_listing_main(id):
     from backend.ebay_cli import single_get_detailed_item_data
     
     # Handle URL parsing if needed
-    if (id[0] == 'h' or id[0] == 'e'):
-        id = id.split('/itm/')[1].split('?')[0]
+    id = _item_id_from(id)
 
     # Get listing data from eBay API
     listing = single_get_detailed_item_data(id, verbose=True)
@@ -154,9 +163,7 @@ def testing_function(id=None):
         return {"error": "No eBay listing ID or URL provided"}
     
     # Handle URL parsing if needed
-    item_id = id
-    if id and (id[0] == 'h' or id[0] == 'e'):
-        item_id = id.split('/itm/')[1].split('?')[0]
+    item_id = _item_id_from(id)
 
     print(f"🔍 Testing update_listing_with_aspects() with eBay listing ID: {item_id}")
     
@@ -4,6 +4,9 @@ Module for creating eBay inventory and offer objects and saving them to JSON fil
 
 import os
 import json
+import threading
+import orjson
+from contextlib import contextmanager
 import requests
 from dotenv import load_dotenv
 from datetime import datetime
@@ -22,6 +25,10 @@ EBAY_INVENTORY_API_BASE = "https://api.ebay.com/sell/inventory/v1"
 # Config file path
 CONFIG_FILE = "listingPreferences.json"
 
+# Listing drafts live in <project root>/Generated_Listings; resolved once at import
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+GENERATED_LISTINGS_DIR = os.path.join(PROJECT_ROOT, "Generated_Listings")
+
 def load_config():
     """
     Load configuration from listingPreferences.json file.
@@ -289,9 +296,7 @@ def create_listing_with_preferences(
     listing_object["offer"] = offer_data
     
     # Create Generated_Listings directory if it doesn't exist
-    # Use absolute path to ensure we're saving in the right directory (project root)
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    output_dir = os.path.join(base_dir, "Generated_Listings")
+    output_dir = GENERATED_LISTINGS_DIR
     os.makedirs(output_dir, exist_ok=True)
     
     # Generate filename if not provided (simply use SKU)
@@ -306,8 +311,7 @@ def create_listing_with_preferences(
     output_path = os.path.join(output_dir, output_filename)
     
     # Write to JSON file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(listing_object, f, indent=2, ensure_ascii=False)
+    write_listing_file(output_path, listing_object)
     
     print(f"Created listing file: {output_path}")
     print(f"   SKU: {sku}")
@@ -329,9 +333,7 @@ def load_listing_data(sku=None, filename=None):
     Returns:
         dict: Dictionary with "sku", "inventoryItem", and "offer" keys, or None if file doesn't exist
     """
-    # Use absolute path to ensure we're looking in the right directory (project root)
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    output_dir = os.path.join(base_dir, "Generated_Listings")
+    output_dir = GENERATED_LISTINGS_DIR
     
     # If specific filename provided, use it
     if filename:
@@ -351,8 +353,8 @@ def load_listing_data(sku=None, filename=None):
         if not os.path.exists(filepath):
             return None
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            listing_data = json.load(f)
+        with open(filepath, 'rb') as f:
+            listing_data = orjson.loads(f.read())
 
         return listing_data
     except Exception as e:
@@ -378,8 +380,7 @@ def extract_metadata_for_llm(listing_data):
 
 
 def _get_generated_listings_dir():
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    return os.path.join(base_dir, "Generated_Listings")
+    return GENERATED_LISTINGS_DIR
 
 
 def resolve_listing_json_path(sku=None, filename=None):
@@ -399,6 +400,24 @@ def resolve_listing_json_path(sku=None, filename=None):
     return filepath
 
 
+def write_listing_file(filepath, listing_data):
+    """
+    Write listing data as 2-space-indented UTF-8 JSON, atomically.
+
+    The JSON goes to a temp file beside the target and is moved into place with
+    os.replace, so a reader (or a crash mid-write) never sees a partial file.
+    """
+    tmp_path = f"{filepath}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(listing_data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def save_ebay_listing_id(sku=None, filename=None, ebay_listing_id=None):
     """
     Persist the live eBay listing id to the listing JSON file.
@@ -425,11 +444,10 @@ def save_ebay_listing_id(sku=None, filename=None, ebay_listing_id=None):
         return False
 
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            listing_data = json.load(f)
+        with open(filepath, 'rb') as f:
+            listing_data = orjson.loads(f.read())
         listing_data["ebayListingId"] = lid
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(listing_data, f, indent=2, ensure_ascii=False)
+        write_listing_file(filepath, listing_data)
         print(f"✅ Saved ebayListingId to {os.path.basename(filepath)}")
         return True
     except Exception as e:
@@ -496,11 +514,10 @@ def update_local_listing_quantity(sku=None, quantity=None):
         return False
 
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            listing_data = json.load(f)
+        with open(filepath, 'rb') as f:
+            listing_data = orjson.loads(f.read())
         listing_data.setdefault("offer", {})["quantity"] = int(quantity)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(listing_data, f, indent=2, ensure_ascii=False)
+        write_listing_file(filepath, listing_data)
         return True
     except Exception as e:
         print(f"❌ update_local_listing_quantity error: {e}")
@@ -527,14 +544,13 @@ def backfill_ebay_listing_id_on_all_files():
             continue
         filepath = os.path.join(output_dir, name)
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                listing_data = json.load(f)
+            with open(filepath, 'rb') as f:
+                listing_data = orjson.loads(f.read())
             if "ebayListingId" in listing_data:
                 skipped += 1
                 continue
             listing_data["ebayListingId"] = ""
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(listing_data, f, indent=2, ensure_ascii=False)
+            write_listing_file(filepath, listing_data)
             updated += 1
         except Exception as e:
             print(f"❌ backfill error {name}: {e}")
@@ -554,38 +570,118 @@ def listing_file_exists(sku):
     Returns:
         bool: True if the file exists, False otherwise
     """
-    # Use absolute path to ensure we're looking in the right directory
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    output_dir = os.path.join(base_dir, "Generated_Listings")
+    output_dir = GENERATED_LISTINGS_DIR
     filepath = os.path.join(output_dir, f"{sku}.json")
     return os.path.exists(filepath)
 
 
-def update_listing_models(sku, models):
+@contextmanager
+def edit_listing(sku):
     """
-    Write or overwrite the "models" key in an existing listing JSON file.
+    Read {sku}.json once, yield the dict for in-place edits, then write it back
+    atomically when the block exits cleanly.
+
+    An exception inside the block propagates and leaves the file untouched, so
+    several edits applied in one block land together or not at all.
 
     Args:
-        sku (str): The SKU of the listing to update
-        models (dict): e.g. {"text_model": "...", "image_model": "...", "classifier_model": "..."}
+        sku (str): The SKU of the listing to edit
+
+    Yields:
+        dict: The listing data to mutate
+
+    Raises:
+        FileNotFoundError: If the listing file does not exist
+    """
+    filepath = resolve_listing_json_path(sku=sku)
+    with open(filepath, 'rb') as f:
+        listing_data = orjson.loads(f.read())
+    yield listing_data
+    write_listing_file(filepath, listing_data)
+
+
+def apply_listing_models(listing_data, models):
+    """Set the "models" key on listing data in memory."""
+    listing_data["models"] = models
+
+
+def apply_listing_title_description(listing_data, new_text):
+    """
+    Set title and description on listing data in memory.
+
+    Raises:
+        ValueError: If new_text has no non-empty 'edited_title'
+        KeyError: If the listing has no inventoryItem.product
+    """
+    new_title = new_text.get('edited_title', '')
+    if not new_title:
+        raise ValueError("new_text dict must contain a non-empty 'edited_title' key")
+    product = listing_data["inventoryItem"]["product"]
+    product["title"] = new_title
+    product["description"] = new_text.get('edited_description', '')
+
+
+def apply_listing_meta_data(listing_data, new_price, new_category_id):
+    """
+    Set price and categoryId on listing data in memory.
+
+    Raises:
+        KeyError: If the listing has no offer.pricingSummary.price
+    """
+    listing_data["offer"]["pricingSummary"]["price"]["value"] = new_price
+    listing_data["offer"]["categoryId"] = new_category_id
+
+
+def apply_listing_images(listing_data, image_urls):
+    """
+    Set imageUrls on listing data in memory, creating inventoryItem.product if needed.
+
+    Raises:
+        ValueError: If image_urls is not a non-empty list
+    """
+    if not image_urls or not isinstance(image_urls, list):
+        raise ValueError("image_urls must be a non-empty list")
+    listing_data.setdefault("inventoryItem", {}).setdefault("product", {})["imageUrls"] = image_urls
+
+
+def _update_listing(sku, apply, *args):
+    """
+    Run one apply_listing_* edit against {sku}.json and write it back.
 
     Returns:
-        bool: True if successful
+        dict | bool: The updated listing data on success (so callers needn't re-read the file), False otherwise
     """
     if not listing_file_exists(sku):
-        print(f"⚠️  update_listing_models: file not found for SKU: {sku}")
+        print(f"⚠️  Listing file not found for SKU: {sku}")
         return False
-    filepath = resolve_listing_json_path(sku=sku)
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            listing_data = json.load(f)
-        listing_data["models"] = models
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(listing_data, f, indent=2, ensure_ascii=False)
-        return True
+        with edit_listing(sku) as listing_data:
+            apply(listing_data, *args)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
+    except KeyError as e:
+        print(f"❌ Error: Missing required key in listing data: {e}")
+        return False
     except Exception as e:
-        print(f"❌ update_listing_models error: {e}")
+        print(f"❌ Error updating listing data file: {e}")
         return False
+    print(f"✅ Updated listing file: {sku}.json")
+    return listing_data
+
+
+def update_listing_models(sku, models):
+    """
+    Write or overwrite the "models" key in an existing listing JSON file.
+
+    Args:
+        sku (str): The SKU of the listing to update
+        models (dict): e.g. {"text_model": "...", "image_model": "...", "classifier_model": "..."}
+
+    Returns:
+        dict | bool: The updated listing data on success (so callers needn't re-read the file), False otherwise
+    """
+    return _update_listing(sku, apply_listing_models, models)
 
 
 def update_listing_title_description(sku, new_text):
@@ -597,51 +693,14 @@ def update_listing_title_description(sku, new_text):
         new_text (dict): Dictionary containing optimized content with 'edited_title' and 'edited_description' keys
     
     Returns:
-        bool: True if update was successful, False otherwise
+        dict | bool: The updated listing data on success (so callers needn't re-read the file), False otherwise
     """
-    # Check if file exists using helper function
-    if not listing_file_exists(sku):
-        print(f"⚠️  Listing file not found for SKU: {sku}")
-        return False
-    
-    # Extract edited_title and edited_description from new_text dict
-    new_title = new_text.get('edited_title', '')
-    new_description = new_text.get('edited_description', '')
-    
-    if not new_title:
-        print(f"❌ Error: new_text dict must contain a non-empty 'edited_title' key")
-        return False
-    
-    # Use absolute path to ensure we're looking in the right directory
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    output_dir = os.path.join(base_dir, "Generated_Listings")
-    filepath = os.path.join(output_dir, f"{sku}.json")
-    
-    try:
-        # Load the existing listing data
-        with open(filepath, 'r', encoding='utf-8') as f:
-            listing_data = json.load(f)
-        
-        # Update title and description
-        listing_data["inventoryItem"]["product"]["title"] = new_title
-        listing_data["inventoryItem"]["product"]["description"] = new_description
-        
-        # Save the updated data back to the file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(listing_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Updated listing file: {os.path.basename(filepath)}")
-        print(f"   SKU: {sku}")
-        print(f"   Title: {new_title}")
+    listing_data = _update_listing(sku, apply_listing_title_description, new_text)
+    if listing_data:
+        new_description = new_text.get('edited_description', '')
+        print(f"   Title: {new_text.get('edited_title', '')}")
         print(f"   Description: {new_description[:50]}..." if len(new_description) > 50 else f"   Description: {new_description}")
-        
-        return True
-    except KeyError as e:
-        print(f"❌ Error: Missing required key in listing data: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Error updating listing data file: {e}")
-        return False
+    return listing_data
 
 
 def update_listing_meta_data(sku, new_price, new_category_id):
@@ -654,43 +713,13 @@ def update_listing_meta_data(sku, new_price, new_category_id):
         new_category_id (str): New categoryId to set (as string, e.g., "181415")
     
     Returns:
-        bool: True if update was successful, False otherwise
+        dict | bool: The updated listing data on success (so callers needn't re-read the file), False otherwise
     """
-    # Check if file exists using helper function
-    if not listing_file_exists(sku):
-        print(f"⚠️  Listing file not found for SKU: {sku}")
-        return False
-    
-    # Use absolute path to ensure we're looking in the right directory
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    output_dir = os.path.join(base_dir, "Generated_Listings")
-    filepath = os.path.join(output_dir, f"{sku}.json")
-    
-    try:
-        # Load the existing listing data
-        with open(filepath, 'r', encoding='utf-8') as f:
-            listing_data = json.load(f)
-        
-        # Update price and categoryId
-        listing_data["offer"]["pricingSummary"]["price"]["value"] = new_price
-        listing_data["offer"]["categoryId"] = new_category_id
-        
-        # Save the updated data back to the file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(listing_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Updated listing file: {os.path.basename(filepath)}")
-        print(f"   SKU: {sku}")
+    listing_data = _update_listing(sku, apply_listing_meta_data, new_price, new_category_id)
+    if listing_data:
         print(f"   Price: {new_price}")
         print(f"   Category ID: {new_category_id}")
-        
-        return True
-    except KeyError as e:
-        print(f"❌ Error: Missing required key in listing data: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Error updating listing data file: {e}")
-        return False
+    return listing_data
 
 
 def update_listing_images(sku, image_urls):
@@ -702,55 +731,16 @@ def update_listing_images(sku, image_urls):
         image_urls (list[str]): List of image URLs to set
     
     Returns:
-        bool: True if update was successful, False otherwise
+        dict | bool: The updated listing data on success (so callers needn't re-read the file), False otherwise
     """
-    # Check if file exists using helper function
-    if not listing_file_exists(sku):
-        print(f"⚠️  Listing file not found for SKU: {sku}")
-        return False
-    
-    if not image_urls or not isinstance(image_urls, list):
-        print(f"❌ Error: image_urls must be a non-empty list")
-        return False
-    
-    # Use absolute path to ensure we're looking in the right directory
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    output_dir = os.path.join(base_dir, "Generated_Listings")
-    filepath = os.path.join(output_dir, f"{sku}.json")
-    
-    try:
-        # Load the existing listing data
-        with open(filepath, 'r', encoding='utf-8') as f:
-            listing_data = json.load(f)
-        
-        # Ensure product structure exists
-        if "inventoryItem" not in listing_data:
-            listing_data["inventoryItem"] = {}
-        if "product" not in listing_data["inventoryItem"]:
-            listing_data["inventoryItem"]["product"] = {}
-        
-        # Update imageUrls
-        listing_data["inventoryItem"]["product"]["imageUrls"] = image_urls
-        
-        # Save the updated data back to the file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(listing_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Updated listing file: {os.path.basename(filepath)}")
-        print(f"   SKU: {sku}")
+    listing_data = _update_listing(sku, apply_listing_images, image_urls)
+    if listing_data:
         print(f"   Images: {len(image_urls)} image URL(s) added")
         for idx, url in enumerate(image_urls[:5], 1):  # Show first 5
             print(f"      {idx}. {url}")
         if len(image_urls) > 5:
             print(f"      ... and {len(image_urls) - 5} more")
-        
-        return True
-    except KeyError as e:
-        print(f"❌ Error: Missing required key in listing data: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Error updating listing data file: {e}")
-        return False
+    return listing_data
 
 
 def get_item_aspects_for_category(category_id, category_tree_id="0"):
@@ -765,7 +755,7 @@ def get_item_aspects_for_category(category_id, category_tree_id="0"):
         dict: Response data containing aspects, or None on failure
     """
     # Import here to avoid circular import issues
-    from backend.helper_functions import helper_get_valid_token, handle_http_error
+    from backend.helper_functions import helper_get_valid_token, handle_http_error, http_session
     
     # Get a valid token
     valid_token = helper_get_valid_token()
@@ -786,7 +776,7 @@ def get_item_aspects_for_category(category_id, category_tree_id="0"):
     
     try:
         print(f"🔍 Fetching aspects for category {category_id}...")
-        response = requests.get(url, headers=headers, params=params)
+        response = http_session.get(url, headers=headers, params=params, timeout=30)
         
         if response.status_code == 200:
             data = response.json()
@@ -903,9 +893,9 @@ def compute_aspects_for_category(category_id, localizedAspects=None):
     return matched_aspects if matched_aspects else None
 
 
-def update_listing_with_aspects(sku, localizedAspects=None, pre_fetched_aspects=None):
+def apply_listing_aspects(listing_data, localizedAspects=None, pre_fetched_aspects=None):
     """
-    Update a listing JSON file to add aspect values. Applies localized aspects first,
+    Add aspect values to listing data in memory. Applies localized aspects first,
     then hardcoded aspects (which override localized aspects if there's a conflict).
 
     Hardcoded aspects (override localized aspects):
@@ -915,7 +905,7 @@ def update_listing_with_aspects(sku, localizedAspects=None, pre_fetched_aspects=
     - "Color": ["Black"]
 
     Args:
-        sku (str): The SKU of the listing to update
+        listing_data (dict): Listing data to modify in place
         localizedAspects (list[dict], optional): List of aspect dictionaries with structure:
             {
                 "type": "STRING",
@@ -925,8 +915,9 @@ def update_listing_with_aspects(sku, localizedAspects=None, pre_fetched_aspects=
             Defaults to None (empty list).
         pre_fetched_aspects (dict, optional): Pre-computed aspects dict; skips Taxonomy API call.
 
-    Returns:
-        bool: True if update was successful, False otherwise
+    Raises:
+        ValueError: If the category's aspects can't be determined or nothing matched
+        KeyError: If the listing has no inventoryItem.product
     """
     # Define hardcoded aspect values (these override localized aspects)
     hardcoded_aspects = {
@@ -940,32 +931,20 @@ def update_listing_with_aspects(sku, localizedAspects=None, pre_fetched_aspects=
     if localizedAspects is None:
         localizedAspects = []
 
-    # Check if file exists
-    if not listing_file_exists(sku):
-        print(f"⚠️  Listing file not found for SKU: {sku}")
-        return False
-
-    # Load the listing data
-    listing_data = load_listing_data(sku=sku)
-    if not listing_data:
-        return False
-
     # If pre-computed aspects were provided, skip the Taxonomy API call
     if pre_fetched_aspects:
         matched_aspects = pre_fetched_aspects
-        print(f"[update_listing_with_aspects] Using pre-fetched aspects ({len(matched_aspects)} keys)")
+        print(f"[apply_listing_aspects] Using pre-fetched aspects ({len(matched_aspects)} keys)")
     else:
         # Get category ID from the listing
         category_id = listing_data.get('offer', {}).get('categoryId')
         if not category_id:
-            print(f"❌ Error: No categoryId found in listing data")
-            return False
+            raise ValueError("No categoryId found in listing data")
 
         # Get aspects for this category
         aspects_data = get_item_aspects_for_category(category_id)
         if not aspects_data:
-            print(f"❌ Error: Could not get aspects for category {category_id}")
-            return False
+            raise ValueError(f"Could not get aspects for category {category_id}")
 
         # Get list of available aspects from API response
         aspects_list = aspects_data.get('aspects', [])
@@ -1023,40 +1002,27 @@ def update_listing_with_aspects(sku, localizedAspects=None, pre_fetched_aspects=
                 print(f"   ⚠ Added hardcoded aspect (not verified in category): {hardcoded_name} = {hardcoded_value}")
 
     if not matched_aspects:
-        print(f"ℹ️  No matching aspects found")
-        return False
-    
-    # Update the listing JSON file
-    # Use absolute path to ensure we're looking in the right directory
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    output_dir = os.path.join(base_dir, "Generated_Listings")
-    filepath = os.path.join(output_dir, f"{sku}.json")
-    
-    try:
-        # Ensure aspects dictionary exists
-        if "aspects" not in listing_data["inventoryItem"]["product"]:
-            listing_data["inventoryItem"]["product"]["aspects"] = {}
-        
-        # Add or update the matched aspects
-        for aspect_name, aspect_value in matched_aspects.items():
-            listing_data["inventoryItem"]["product"]["aspects"][aspect_name] = aspect_value
-        
-        # Save the updated data back to the file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(listing_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Updated listing file: {os.path.basename(filepath)}")
-        print(f"   SKU: {sku}")
-        for aspect_name, aspect_value in matched_aspects.items():
-            print(f"   Added aspect: {aspect_name} = {aspect_value}")
-        
-        return True
-    except KeyError as e:
-        print(f"❌ Error: Missing required key in listing data: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Error updating listing data file: {e}")
-        return False
+        raise ValueError("No matching aspects found")
+
+    aspects = listing_data["inventoryItem"]["product"].setdefault("aspects", {})
+    for aspect_name, aspect_value in matched_aspects.items():
+        aspects[aspect_name] = aspect_value
+        print(f"   Added aspect: {aspect_name} = {aspect_value}")
+
+
+def update_listing_with_aspects(sku, localizedAspects=None, pre_fetched_aspects=None):
+    """
+    Update a listing JSON file to add aspect values (see apply_listing_aspects).
+
+    Args:
+        sku (str): The SKU of the listing to update
+        localizedAspects (list[dict], optional): Aspects from the source listing
+        pre_fetched_aspects (dict, optional): Pre-computed aspects dict; skips Taxonomy API call.
+
+    Returns:
+        dict | bool: The updated listing data on success (so callers needn't re-read the file), False otherwise
+    """
+    return _update_listing(sku, apply_listing_aspects, localizedAspects, pre_fetched_aspects)
 
 
 if __name__ == "__main__":
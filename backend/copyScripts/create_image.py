@@ -10,10 +10,11 @@ import base64
 import requests
 import xml.etree.ElementTree as ET
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
-from backend.helper_functions import helper_get_valid_token
+from backend.helper_functions import helper_get_valid_token, http_session
 
 # Load environment variables
 load_dotenv()
@@ -24,6 +25,9 @@ API_KEY = os.getenv('api_key')
 CLIENT_SECRET = os.getenv('client_secret')
 USER_TOKEN = os.getenv('user_token')
 
+# Upper bound on concurrent classifier calls made by one categorize_images() call
+MAX_CATEGORIZE_WORKERS = 8
+
 
 class ImageType(Enum):
     """Enum for image generation types."""
@@ -265,7 +269,7 @@ def _process_single_image(image_data, image_url, is_base64, mime_type, image_typ
             # Download image from URL
             print(f"📥 Downloading image from URL (image {index + 1})...")
             try:
-                img_response = requests.get(image_url, timeout=30)
+                img_response = http_session.get(image_url, timeout=30)
                 img_response.raise_for_status()
                 image_bytes = img_response.content
                 
@@ -450,7 +454,7 @@ def upload_image_bytes_to_ebay(image_bytes, mime_type, picture_name="Uploaded Im
         # Update headers with multipart content type
         headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
         
-        response = requests.post(url, data=multipart_body, headers=headers, timeout=60)
+        response = http_session.post(url, data=multipart_body, headers=headers, timeout=60)
 
         if response.status_code != 200:
             print(f"❌ HTTP Error {response.status_code}")
@@ -669,7 +673,7 @@ def generate_image_from_urls(
     
     try:
         print(f"🤖 Calling OpenRouter image model {model} ({image_type.value})...")
-        response = requests.post(url, headers=headers, data=json.dumps(data), timeout=60)
+        response = http_session.post(url, headers=headers, data=json.dumps(data), timeout=60)
         
         response.raise_for_status()
         
@@ -754,7 +758,7 @@ def _bedrock_stability_generate(image_urls, prompt_text, model):
 
     # Fetch the first image and base64-encode it
     try:
-        img_response = requests.get(image_urls[0], timeout=30)
+        img_response = http_session.get(image_urls[0], timeout=30)
         img_response.raise_for_status()
         image_b64 = base64.b64encode(img_response.content).decode("utf-8")
     except Exception as e:
@@ -1049,7 +1053,7 @@ def _openrouter_response_dict_to_image_bytes_and_mime(result):
             return image_bytes, mime_out
         if image_url:
             print("📥 Downloading generated image...")
-            img_response = requests.get(image_url, timeout=30)
+            img_response = http_session.get(image_url, timeout=30)
             img_response.raise_for_status()
             image_bytes = img_response.content
             content_type = img_response.headers.get("content-type", "")
@@ -1213,7 +1217,7 @@ def categorize_image(image_url, model="bytedance-seed/seed-1.6-flash"):
     }
     
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(data), timeout=60)
+        response = http_session.post(url, headers=headers, data=json.dumps(data), timeout=60)
         response.raise_for_status()
         result = response.json()
         
@@ -1292,24 +1296,27 @@ def categorize_images(image_urls, model="bytedance-seed/seed-1.6-flash"):
         print("ERROR: image_urls must be a non-empty list of image URLs")
         return None
     
-    # Categorize each image
-    categories = {}
-    
+    valid_urls = []
     for idx, image_url in enumerate(image_urls):
         if not image_url or not isinstance(image_url, str):
             print(f"WARNING: Skipping invalid image URL at index {idx}")
             continue
-        
-        print(f"Categorizing image {idx + 1}/{len(image_urls)}: {image_url[:50]}...")
+        valid_urls.append(image_url)
+    # Each distinct URL is classified once
+    valid_urls = list(dict.fromkeys(valid_urls))
+    
+    # Categorize each image; the calls are independent round trips, so run them concurrently
+    def categorize_one(image_url):
         category = categorize_image(image_url, model=model)
-        
-        if category:
-            categories[image_url] = category
-            print(f"  -> {category}")
-        else:
-            print(f"  -> Failed to categorize")
-            # Still add to dict with None to indicate failure
-            categories[image_url] = None
+        print(f"Categorized {image_url[:50]}... -> {category or 'Failed to categorize'}")
+        return category
+    
+    categories = {}
+    if valid_urls:
+        with ThreadPoolExecutor(max_workers=min(MAX_CATEGORIZE_WORKERS, len(valid_urls))) as executor:
+            # map() keeps input order; failures stay in the dict as None
+            for image_url, category in zip(valid_urls, executor.map(categorize_one, valid_urls)):
+                categories[image_url] = category
     
     if not categories:
         print("ERROR: Failed to categorize any images")
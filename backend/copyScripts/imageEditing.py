@@ -7,10 +7,26 @@ and canvas-based image composition.
 
 import io
 import base64
+import threading
 
-from rembg import remove
 from PIL import Image
 
+_rembg_session = None
+_rembg_session_lock = threading.Lock()
+
+
+def _get_rembg_session():
+    """Import rembg and load its segmentation model on first use, then reuse both."""
+    global _rembg_session
+    if _rembg_session is None:
+        # Only one caller builds the session; concurrent first calls wait for it
+        with _rembg_session_lock:
+            if _rembg_session is None:
+                # rembg pulls in onnxruntime and loads the model, so keep it off app startup
+                from rembg import new_session
+                _rembg_session = new_session()
+    return _rembg_session
+
 
 def remove_background(image_bytes: bytes) -> bytes:
     """
@@ -22,7 +38,8 @@ def remove_background(image_bytes: bytes) -> bytes:
     Returns:
         bytes: PNG image data with background removed (transparent).
     """
-    output = remove(image_bytes)
+    from rembg import remove
+    output = remove(image_bytes, session=_get_rembg_session())
     return output
 
 
@@ -0,0 +1,87 @@
+"""
+Generated Image Cache Module
+
+Persists eBay-hosted URLs of AI-generated images in a small SQLite file, keyed by
+a hash of (source URL, image type, prompt modifier, model), so confirming the same
+categories again reuses earlier output instead of paying for another generation.
+
+Disable with IMAGE_CACHE=0 in the environment.
+"""
+
+import os
+import time
+import logging
+import sqlite3
+import hashlib
+import threading
+import orjson
+
+_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'image_cache.sqlite')
+
+log = logging.getLogger(__name__)
+
+# eBay picture-hosting URLs for images never attached to a listing eventually lapse
+MAX_AGE_SECONDS = 30 * 24 * 3600
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def image_cache_enabled():
+    return os.getenv('IMAGE_CACHE', '1') == '1'
+
+
+def _connect():
+    global _initialized
+    conn = sqlite3.connect(_DB_PATH, timeout=5)
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS generated_images ("
+                    "key TEXT PRIMARY KEY, urls_json TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                conn.commit()
+                _initialized = True
+    return conn
+
+
+def image_cache_key(source_url, image_type, prompt_modifier=None, model=None):
+    """SHA-256 over everything that changes the generated output."""
+    type_value = getattr(image_type, 'value', image_type)
+    raw = f"{source_url}|{type_value}|{prompt_modifier or ''}|{model or ''}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def get_cached_images(key):
+    """Return the cached list of generated image URLs, or None on miss/expiry/error."""
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT urls_json, created_at FROM generated_images WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        log.warning("Image cache read failed: %s", e)
+        return None
+    if not row or time.time() - row[1] > MAX_AGE_SECONDS:
+        return None
+    return orjson.loads(row[0])
+
+
+def store_cached_images(key, urls):
+    """Remember the generated image URLs for this key."""
+    try:
+        conn = _connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO generated_images (key, urls_json, created_at) VALUES (?, ?, ?)",
+                (key, orjson.dumps(urls).decode(), time.time()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        log.warning("Image cache write failed: %s", e)
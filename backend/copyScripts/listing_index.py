@@ -0,0 +1,174 @@
+"""
+Listing Index Module
+
+SQLite sidecar holding the summary fields the History tab needs for every draft in
+Generated_Listings/. The JSON files stay the source of truth: each row records the
+file's mtime_ns and size, and a query re-parses only files whose stat changed (and
+drops rows for deleted files), so writers never have to update the index themselves.
+"""
+
+import os
+import logging
+import sqlite3
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_DB_PATH = os.path.join(_PROJECT_ROOT, 'listings_index.sqlite')
+
+log = logging.getLogger(__name__)
+
+# Upper bound on threads used to read changed listing files in one sync
+MAX_PARSE_WORKERS = 8
+
+_init_lock = threading.Lock()
+_initialized = False
+
+# Last (directory signature, ordered summary rows) served, so an unchanged
+# directory costs one scandir and no SQLite round trip
+_memory_lock = threading.Lock()
+_memory = {"signature": None, "rows": []}
+
+
+def _connect():
+    global _initialized
+    conn = sqlite3.connect(_DB_PATH, timeout=5)
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS listings ("
+                    "filename TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+                    "created_date TEXT NOT NULL, summary_json BLOB NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_listings_created ON listings (created_date DESC)")
+                conn.commit()
+                _initialized = True
+    return conn
+
+
+def summarize_listing(listing_data, filename):
+    """Extract the summary fields shown in the listings table from a full listing JSON."""
+    product = listing_data.get('inventoryItem', {}).get('product', {})
+    offer = listing_data.get('offer', {})
+    price = offer.get('pricingSummary', {}).get('price', {})
+    image_urls = product.get('imageUrls', [])
+    return {
+        'sku': listing_data.get('sku', filename.replace('.json', '')),
+        'title': product.get('title', 'No title'),
+        'description': product.get('description', ''),
+        'price': price.get('value', 'N/A'),
+        'currency': price.get('currency', 'USD'),
+        'categoryId': offer.get('categoryId', 'N/A'),
+        'createdDateTime': listing_data.get('createdDateTime', ''),
+        'imageCount': len(image_urls),
+        'imageUrls': image_urls,
+        'quantity': offer.get('quantity', 0),
+        'filename': filename,
+        'fileSku': filename.replace('.json', ''),  # SKU derived from filename
+        'ebayListingId': str(listing_data.get('ebayListingId') or '').strip(),
+        'models': listing_data.get('models') or None,
+    }
+
+
+def _scan_listing_files(listings_dir):
+    """Return {filename: (path, mtime_ns, size)} for every listing JSON, from one scandir pass."""
+    files = {}
+    with os.scandir(listings_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.json') or not entry.is_file():
+                continue
+            st = entry.stat()
+            files[entry.name] = (entry.path, st.st_mtime_ns, st.st_size)
+    return files
+
+
+def _directory_signature(listings_dir, files):
+    return (listings_dir, frozenset((name, mtime_ns, size) for name, (_, mtime_ns, size) in files.items()))
+
+
+def _summarize_file(name, path):
+    """Parse one listing file into its summary, or None if it can't be read."""
+    try:
+        with open(path, 'rb') as f:
+            return summarize_listing(orjson.loads(f.read()), name)
+    except Exception as e:
+        log.warning("Error reading %s: %s", name, e)
+        return None
+
+
+def _sync_index(conn, files):
+    """Bring the index in line with the scanned files, re-reading only new or changed ones."""
+    indexed = {
+        row[0]: (row[1], row[2])
+        for row in conn.execute("SELECT filename, mtime_ns, size FROM listings")
+    }
+
+    stale = [(name, path) for name, (path, mtime_ns, size) in files.items() if indexed.get(name) != (mtime_ns, size)]
+    if len(stale) > 1:
+        # Cold start / bulk change: overlap the file reads; SQLite writes stay on this thread
+        with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(stale))) as executor:
+            summaries = list(executor.map(lambda item: _summarize_file(*item), stale))
+    else:
+        summaries = [_summarize_file(name, path) for name, path in stale]
+
+    for (name, _), summary in zip(stale, summaries):
+        if summary is None:
+            conn.execute("DELETE FROM listings WHERE filename = ?", (name,))
+            continue
+        mtime_ns, size = files[name][1:]
+        conn.execute(
+            "INSERT OR REPLACE INTO listings (filename, mtime_ns, size, created_date, summary_json) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (name, mtime_ns, size, summary['createdDateTime'] or '', orjson.dumps(summary)),
+        )
+
+    removed = [(name,) for name in indexed if name not in files]
+    if removed:
+        conn.executemany("DELETE FROM listings WHERE filename = ?", removed)
+    conn.commit()
+
+
+def iter_listing_summaries_json(listings_dir):
+    """
+    Yield the stored JSON bytes of each listing summary in listings_dir, newest first.
+
+    Rows are read straight off the cursor, so callers can stream them into a
+    response without materializing or re-serializing the whole list.
+
+    Args:
+        listings_dir (str): Path to the Generated_Listings directory
+
+    Yields:
+        bytes: orjson-encoded summary as produced by summarize_listing()
+    """
+    files = _scan_listing_files(listings_dir)
+    signature = _directory_signature(listings_dir, files)
+    with _memory_lock:
+        if _memory["signature"] == signature:
+            rows = _memory["rows"]
+        else:
+            rows = None
+    if rows is not None:
+        yield from rows
+        return
+
+    rows = []
+    conn = _connect()
+    try:
+        _sync_index(conn, files)
+        for (summary_json,) in conn.execute("SELECT summary_json FROM listings ORDER BY created_date DESC"):
+            rows.append(summary_json)
+            yield summary_json
+    finally:
+        conn.close()
+
+    with _memory_lock:
+        _memory["signature"] = signature
+        _memory["rows"] = rows
+
+
+def get_listing_summaries(listings_dir):
+    """Return summary dicts for every listing JSON in listings_dir, newest first."""
+    return [orjson.loads(raw) for raw in iter_listing_summaries_json(listings_dir)]
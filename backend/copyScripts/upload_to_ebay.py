@@ -27,7 +27,7 @@ import os
 import requests
 import json
 from dotenv import load_dotenv
-from backend.helper_functions import helper_get_valid_token, handle_http_error
+from backend.helper_functions import helper_get_valid_token, handle_http_error, http_session
 
 # Load environment variables
 load_dotenv()
@@ -99,7 +99,7 @@ def create_ebay_listing(sku, inventory_item_data, locale="en-US", use_user_token
         print(f"📦 Step 1: Creating/updating inventory item with SKU: {sku}")
         print(f"🌐 Locale: {locale}")
         
-        response = requests.put(url, headers=headers, json=inventory_item_data, timeout=30)
+        response = http_session.put(url, headers=headers, json=inventory_item_data, timeout=30)
         
         # According to eBay API docs, 204 (No Content) is the expected success response
         # for createOrReplaceInventoryItem - it means success with no response body
@@ -201,7 +201,7 @@ def create_offer(sku, offer_data, locale="en-US", use_user_token=True):
         print(f"📝 Step 2: Creating offer for SKU: {sku}")
         print(f"💰 Price: ${offer_data.get('pricingSummary', {}).get('price', {}).get('value', 'N/A')}")
         
-        response = requests.post(url, headers=headers, json=offer_data, timeout=30)
+        response = http_session.post(url, headers=headers, json=offer_data, timeout=30)
         
         if response.status_code == 201:
             result = response.json()
@@ -302,7 +302,7 @@ def publish_offer(offer_id, locale="en-US", use_user_token=True):
     
     try:
         print(f"🚀 Step 3: Publishing offer: {offer_id}")
-        response = requests.post(url, headers=headers, timeout=30)
+        response = http_session.post(url, headers=headers, timeout=30)
         
         if response.status_code == 200:
             result = response.json()
@@ -425,7 +425,7 @@ def create_inventory_location(merchant_location_key="PlasticLoveShopLocation", l
         print(f"📮 Postal Code: {postal_code}")
         print(f"🌍 Country: {country}")
         
-        response = requests.post(url, headers=headers, json=location_data, timeout=30)
+        response = http_session.post(url, headers=headers, json=location_data, timeout=30)
         
         # According to eBay API docs, 201 (Created) is the expected success response
         if response.status_code == 201:
@@ -19,7 +19,7 @@ import time
 from datetime import datetime
 import sys
 
-from backend.helper_functions import remove_html_tags, helper_get_valid_token, handle_http_error, refreshToken
+from backend.helper_functions import remove_html_tags, helper_get_valid_token, handle_http_error, refreshToken, http_session
 
 # Import from copyScripts package
 from backend.copyScripts.upload_to_ebay import upload_complete_listing, create_inventory_location, create_test_listing
@@ -127,7 +127,7 @@ def singleSearch(query):
 
     try:
         headers = browse_api_headers(valid_token)
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = http_session.get(url, headers=headers, params=params, timeout=30)
 
         if response.status_code == 200:
             _print_browse_results(response.json())
@@ -138,7 +138,7 @@ def singleSearch(query):
                 print("❌ Could not refresh token")
                 return
             headers = browse_api_headers(new_token)
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = http_session.get(url, headers=headers, params=params, timeout=30)
             if response.status_code == 200:
                 _print_browse_results(response.json())
             else:
@@ -206,7 +206,7 @@ def single_search_by_seller(seller_username, query="", limit=50, offset=0):
             print(f"🔍 With keyword filter: {query}")
 
         headers = browse_api_headers(valid_token)
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = http_session.get(url, headers=headers, params=params, timeout=30)
 
         if response.status_code == 200:
             return _print_and_pack_seller_search(response.json(), seller_username, query)
@@ -218,7 +218,7 @@ def single_search_by_seller(seller_username, query="", limit=50, offset=0):
                 print("❌ Could not refresh token")
                 return None
             headers = browse_api_headers(new_token)
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = http_session.get(url, headers=headers, params=params, timeout=30)
             if response.status_code == 200:
                 return _print_and_pack_seller_search(response.json(), seller_username, query)
             print(f"❌ Still failed after refresh: {response.status_code}")
@@ -258,7 +258,7 @@ def call_openrouter_llm(prompt, model="deepseek/deepseek-v4-flash"):
     
     try:
         print(f"🤖 Calling OpenRouter model: {model}...")
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = http_session.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -300,7 +300,7 @@ def call_openrouter_llm_stream(prompt, model="deepseek/deepseek-v4-flash"):
     }
 
     try:
-        with requests.post(url, headers=headers, json=data, stream=True, timeout=60) as response:
+        with http_session.post(url, headers=headers, json=data, stream=True, timeout=60) as response:
             response.raise_for_status()
             for line in response.iter_lines():
                 if not line:
@@ -475,7 +475,7 @@ def find_variation_id(listing_id):
     params = {'item_group_id': listing_id}
 
     def _do_request(token):
-        return requests.get(
+        return http_session.get(
             url,
             headers=browse_api_headers(token),
             params=params,
@@ -578,7 +578,7 @@ def single_get_detailed_item_data(item_id, verbose=True):
         url = f"https://api.ebay.com/buy/browse/v1/item/{rid}"
         if verbose:
             print(f"🔍 Fetching complete item data for: {rid}")
-        return requests.get(url, headers=headers)
+        return http_session.get(url, headers=headers, timeout=30)
 
     try:
         response = _attempt_get_item(rest_item_id)
@@ -679,7 +679,7 @@ def getItemIds(seller_username, query=" ", limit_per_request=200):
             request_count += 1
             print(f"\n📦 Request #{request_count} - Offset: {offset}, Limit: {limit_per_request}")
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http_session.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -720,7 +720,7 @@ def getItemIds(seller_username, query=" ", limit_per_request=200):
                 if new_token:
                     # Retry with new token
                     headers['Authorization'] = f'Bearer {new_token}'
-                    response = requests.get(url, headers=headers, params=params)
+                    response = http_session.get(url, headers=headers, params=params)
                     if response.status_code == 200:
                         # Process the response
                         data = response.json()
@@ -1384,7 +1384,7 @@ def add_item(item_data):
         print(f"💰 Price: ${item_data['StartPrice']} {item_data['Currency']}")
         print(f"📂 Category: {item_data['CategoryID']}")
         
-        response = requests.post(url, data=xml_payload, headers=headers, timeout=30)
+        response = http_session.post(url, data=xml_payload, headers=headers, timeout=30)
         
         if response.status_code == 200:
             # Parse the response
@@ -1510,7 +1510,7 @@ def create_ebay_listing(sku, inventory_item_data, locale="en_US", use_user_token
             
             print(f"   {key}: {value}")
         
-        response = requests.put(url, headers=headers, json=inventory_item_data, timeout=30)
+        response = http_session.put(url, headers=headers, json=inventory_item_data, timeout=30)
         
         # According to eBay API docs, 204 (No Content) is the expected success response
         # for createOrReplaceInventoryItem - it means success with no response body
@@ -7,17 +7,49 @@ for better code organization and reusability.
 
 import os
 import re
+import html
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # Load .env from project root (one level up from backend/)
 _env_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 load_dotenv(os.path.join(_env_dir, '.env'))
 
+log = logging.getLogger(__name__)
+
 # Constants
 APPLICATION_TOKEN = os.getenv('application_token')
 REFRESH_TOKEN = os.getenv('refresh_token')
 
+# Shared keep-alive connection pool for all eBay/OpenRouter traffic, so concurrent
+# request handlers reuse TCP/TLS connections instead of reconnecting per call.
+# Retries cover connection failures on idempotent methods only (urllib3 default).
+http_session = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=100, max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.3))
+http_session.mount('https://', _http_adapter)
+http_session.mount('http://', _http_adapter)
+# OpenRouter rejects throttled calls with 429 before doing any work, so those are safe to
+# retry on POST too. urllib3 waits backoff_factor * 2**(n - 1) before retry n, except the
+# first retry, which is immediate: 0s, 2s, then 4s. Retry-After is deliberately ignored,
+# since callers such as image generation hold a concurrency slot (image_gen_slots) while
+# the retries sleep; this keeps that hold to at most ~6s per throttled call.
+_openrouter_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=100, max_retries=Retry(
+    total=3, connect=3, read=0, status=3, status_forcelist=(429,), allowed_methods=None,
+    backoff_factor=1, respect_retry_after_header=False, raise_on_status=False,
+))
+http_session.mount('https://openrouter.ai/', _openrouter_adapter)
+
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 def remove_html_tags(text):
     """Efficiently remove HTML tags from text using regex."""
@@ -25,27 +57,343 @@ def remove_html_tags(text):
         return text
     
     # Remove HTML tags
-    clean_text = re.sub(r'<[^>]+>', '', text)
-    
-    # Decode common HTML entities
-    html_entities = {
-        '&amp;': '&',
-        '&lt;': '<',
-        '&gt;': '>',
-        '&quot;': '"',
-        '&#39;': "'",
-        '&nbsp;': ' '
-    }
+    clean_text = _HTML_TAG_RE.sub('', text)
     
-    for entity, replacement in html_entities.items():
-        clean_text = clean_text.replace(entity, replacement)
+    # Decode HTML entities in one pass (&nbsp; becomes U+00A0, which the whitespace pass folds)
+    clean_text = html.unescape(clean_text)
     
     # Clean up extra whitespace
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+    clean_text = _WHITESPACE_RE.sub(' ', clean_text).strip()
     
     return clean_text
 
 
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries go stale after `ttl` seconds.
+
+    Stale entries are kept (until evicted by LRU) so callers can fall back
+    to them when a fresh fetch fails.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, allow_stale=False):
+        """Return the cached value, or None if missing (or expired unless allow_stale)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if not allow_stale and time.monotonic() - stored_at > self.ttl:
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            return self._data.pop(key, (None, None))[1]
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block on the same Future and receive its result (or exception).
+    """
+
+    def __init__(self):
+        self._inflight = {}  # key -> Future
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, timeout=None):
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            return future.result(timeout=timeout)
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return future.result()
+
+
+class RedisCache:
+    """
+    Optional shared cache tier backed by Redis, storing orjson-encoded values.
+
+    redis is imported lazily and is not a hard dependency. Any Redis error is
+    logged and treated as a miss, so callers fall back to their local cache.
+    """
+
+    def __init__(self, url, prefix, ttl=600):
+        import redis
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key):
+        import orjson
+        try:
+            raw = self._client.get(self.prefix + key)
+        except Exception as e:
+            log.warning("Redis get failed: %s", e)
+            return None
+        return orjson.loads(raw) if raw else None
+
+    def set(self, key, value):
+        import orjson
+        try:
+            self._client.setex(self.prefix + key, self.ttl, orjson.dumps(value))
+        except Exception as e:
+            log.warning("Redis set failed: %s", e)
+
+    def delete(self, key):
+        try:
+            self._client.delete(self.prefix + key)
+        except Exception as e:
+            log.warning("Redis delete failed: %s", e)
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Allows bursts of up to `capacity` calls, refilling at `rate` tokens per
+    second. acquire() blocks only as long as needed for the next token.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class TaskStore:
+    """
+    Progress registry for background jobs (e.g. image generation), in process memory.
+
+    Each task is {"status", "total", "completed", "results", "errors", "version"}.
+    Updates to unknown task ids are ignored. get() returns a snapshot safe to serialize.
+
+    Every update runs under the task's own Condition and bumps its version, then
+    wakes all waiters. wait_for_update() takes the version the caller last saw, so
+    any number of streaming listeners on one task each see every change, and an
+    update that lands between a read and the next wait is never lost.
+
+    Tasks are spread over `stripes` sub-dicts by hash(task_id), each with its own
+    lock for structural changes (adding or removing tasks), so unrelated tasks
+    never contend on one registry-wide lock.
+
+    Finished tasks (any status other than "running") are dropped `ttl` seconds
+    after finishing; each create() sweeps its own stripe, so no reaper thread
+    is needed.
+    """
+
+    def __init__(self, stripes=16, ttl=3600):
+        self._stripes = [({}, threading.Lock()) for _ in range(stripes)]
+        self.ttl = ttl
+
+    def _stripe(self, task_id):
+        return self._stripes[hash(task_id) % len(self._stripes)]
+
+    def _lookup(self, task_id):
+        return self._stripe(task_id)[0].get(task_id)
+
+    def _update(self, task_id, op):
+        task = self._lookup(task_id)
+        if task is not None:
+            with task["changed"]:
+                op(task)
+                task["version"] += 1
+                task["changed"].notify_all()
+
+    def create(self, task_id, total):
+        tasks, lock = self._stripe(task_id)
+        now = time.monotonic()
+        with lock:
+            expired = [tid for tid, task in tasks.items() if task["finished_at"] is not None and now - task["finished_at"] > self.ttl]
+            for tid in expired:
+                del tasks[tid]
+            tasks[task_id] = {"status": "running", "total": total, "completed": 0, "results": [], "errors": [], "version": 0, "changed": threading.Condition(), "finished_at": None}
+
+    def append_error(self, task_id, msg):
+        self._update(task_id, lambda task: task["errors"].append(msg))
+
+    def record_item(self, task_id, results=(), error=None, completed=True):
+        """Apply one finished item's outcome (results, error, completed count) in one update."""
+        def op(task):
+            task["results"].extend(results)
+            if error:
+                task["errors"].append(error)
+            if completed:
+                task["completed"] += 1
+        self._update(task_id, op)
+
+    def set_status(self, task_id, status):
+        def op(task):
+            task["status"] = status
+            task["finished_at"] = None if status == "running" else time.monotonic()
+        self._update(task_id, op)
+
+    def get(self, task_id):
+        """Return a copy of the task's state, or None if unknown."""
+        task = self._lookup(task_id)
+        if task is None:
+            return None
+        with task["changed"]:
+            return {
+                "status": task["status"],
+                "total": task["total"],
+                "completed": task["completed"],
+                "results": list(task["results"]),
+                "errors": list(task["errors"]),
+                "version": task["version"],
+            }
+
+    def wait_for_update(self, task_id, version, timeout):
+        """Block until the task's version differs from `version` (True) or timeout passes (False)."""
+        task = self._lookup(task_id)
+        if task is None:
+            return False
+        with task["changed"]:
+            return task["changed"].wait_for(lambda: task["version"] != version, timeout)
+
+
+class RedisTaskStore:
+    """
+    TaskStore backed by Redis so every worker process sees the same task state.
+
+    Scalars live in a hash (completed is bumped with HINCRBY) and results/errors
+    in lists (RPUSH), so updates are atomic server-side with no Python lock.
+    Keys expire `ttl` seconds after the last write. Redis errors are logged and
+    treated as a missing task.
+    """
+
+    def __init__(self, url, prefix="task:", ttl=86400):
+        import redis
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5, decode_responses=True)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _keys(self, task_id):
+        base = self.prefix + task_id
+        return base, base + ":results", base + ":errors"
+
+    def _write(self, task_id, op):
+        try:
+            pipe = self._client.pipeline()
+            op(pipe)
+            # Bumped on every write so wait_for_update() can spot changes with one HGET
+            pipe.hincrby(self._keys(task_id)[0], "version", 1)
+            for key in self._keys(task_id):
+                pipe.expire(key, self.ttl)
+            pipe.execute()
+        except Exception as e:
+            log.warning("Redis task update failed: %s", e)
+
+    def create(self, task_id, total):
+        key = self._keys(task_id)[0]
+        self._write(task_id, lambda p: p.hset(key, mapping={"status": "running", "total": total, "completed": 0}))
+
+    def append_error(self, task_id, msg):
+        key = self._keys(task_id)[2]
+        self._write(task_id, lambda p: p.rpush(key, msg))
+
+    def record_item(self, task_id, results=(), error=None, completed=True):
+        key, results_key, errors_key = self._keys(task_id)
+
+        def op(p):
+            if results:
+                p.rpush(results_key, *results)
+            if error:
+                p.rpush(errors_key, error)
+            if completed:
+                p.hincrby(key, "completed", 1)
+        self._write(task_id, op)
+
+    def set_status(self, task_id, status):
+        key = self._keys(task_id)[0]
+        self._write(task_id, lambda p: p.hset(key, "status", status))
+
+    def get(self, task_id):
+        key, results_key, errors_key = self._keys(task_id)
+        try:
+            pipe = self._client.pipeline()
+            pipe.hgetall(key)
+            pipe.lrange(results_key, 0, -1)
+            pipe.lrange(errors_key, 0, -1)
+            fields, results, errors = pipe.execute()
+        except Exception as e:
+            log.warning("Redis task read failed: %s", e)
+            return None
+        # A late write after expiry recreates the hash with only the fields it touched
+        # (e.g. just `completed` and `version`); without a status it is not a real task
+        if "status" not in fields:
+            return None
+        return {
+            "status": fields["status"],
+            "total": int(fields.get("total", 0)),
+            "completed": int(fields.get("completed", 0)),
+            "results": results,
+            "errors": errors,
+            "version": int(fields.get("version", 0)),
+        }
+
+    def wait_for_update(self, task_id, version, timeout, poll_interval=1.0):
+        """Poll the task's version every poll_interval until it differs from `version` (True) or timeout passes (False)."""
+        key = self._keys(task_id)[0]
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(remaining, poll_interval))
+            try:
+                if int(self._client.hget(key, "version") or 0) != version:
+                    return True
+            except Exception as e:
+                log.warning("Redis task read failed: %s", e)
+                return True
+
+
 def helper_get_valid_token():
     """Get a valid access token, always read fresh from env (frozen module constant may be stale)."""
     load_dotenv(os.path.join(_env_dir, '.env'), override=True)
@@ -1215,118 +1215,164 @@ function App() {
 
       setPendingImagePromptModifier("");
 
-      // Poll for progress updates
-      const pollInterval = setInterval(async () => {
-        try {
-          const statusResponse = await fetch(
-            `/api/generate-images-status/${taskId}`,
-          );
-          const statusData = await statusResponse.json();
+      // Progress updates are pushed by the server (SSE) whenever the task changes
+      const statusSource = new EventSource(
+        `/api/generate-images-stream/${taskId}`,
+      );
 
-          if (
-            statusData.status === "completed" ||
-            statusData.status === "failed"
-          ) {
-            clearInterval(pollInterval);
-
-            if (statusData.status === "completed") {
-              const aiGeneratedList = statusData.generated_images || [];
-              console.log("AI generated images:", aiGeneratedList);
-              console.log(
-                `Successfully generated ${aiGeneratedList.length} image(s)`,
-              );
-
-              const mergedImages = mergeGeneratedImages(photosToProcess, aiGeneratedList, {
-                allowPartial: false,
-              });
-              setGeneratedImages(mergedImages);
-              setCategories(editableCategories);
-              setSelectedImagesForRegen([]);
-              setCustomPrompt("");
-
-              // Sync generated images to the listing JSON on disk so Upload to eBay works
-              if (currentSku && mergedImages.length > 0) {
-                fetch("/api/update-listing-images", {
-                  method: "POST",
-                  headers: { "Content-Type": "application/json" },
-                  body: JSON.stringify({ sku: currentSku, image_urls: mergedImages }),
-                })
-                  .then((r) => r.json())
-                  .then((syncData) => {
-                    if (syncData.listing_data) setListingData(syncData.listing_data);
-                  })
-                  .catch((err) => console.error("Failed to sync images to disk:", err));
-              }
+      const handleStatusError = (statusErr) => {
+        console.error("Error reading generation status:", statusErr);
+        statusSource.close();
+        setError("Error checking generation status");
+        setIsConfirming(false);
+        setImageGenProgress({
+          isActive: false,
+          taskId: null,
+          total: totalImages,
+          completed: 0,
+          currentGenerating: [],
+        });
+      };
 
-              setImageGenProgress({
-                isActive: false,
-                taskId: null,
-                total: totalImages,
-                completed: totalImages,
-                currentGenerating: [],
-              });
-            } else {
-              // Failed - show errors but return partial results if any
-              const aiGeneratedList = statusData.generated_images || [];
-              const partialImages = mergeGeneratedImages(photosToProcess, aiGeneratedList, {
-                allowPartial: true,
-              });
-              setGeneratedImages(partialImages);
-
-              // Sync partial images to disk too
-              if (currentSku && partialImages.length > 0) {
-                fetch("/api/update-listing-images", {
-                  method: "POST",
-                  headers: { "Content-Type": "application/json" },
-                  body: JSON.stringify({ sku: currentSku, image_urls: partialImages }),
+      // Applies one status payload (from the stream or a fallback poll);
+      // returns true once the task has reached a terminal status
+      const handleStatus = (statusData) => {
+        if (
+          statusData.status === "completed" ||
+          statusData.status === "failed"
+        ) {
+          statusSource.close();
+
+          if (statusData.status === "completed") {
+            const aiGeneratedList = statusData.generated_images || [];
+            console.log("AI generated images:", aiGeneratedList);
+            console.log(
+              `Successfully generated ${aiGeneratedList.length} image(s)`,
+            );
+
+            const mergedImages = mergeGeneratedImages(photosToProcess, aiGeneratedList, {
+              allowPartial: false,
+            });
+            setGeneratedImages(mergedImages);
+            setCategories(editableCategories);
+            setSelectedImagesForRegen([]);
+            setCustomPrompt("");
+
+            // Sync generated images to the listing JSON on disk so Upload to eBay works
+            if (currentSku && mergedImages.length > 0) {
+              fetch("/api/update-listing-images", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ sku: currentSku, image_urls: mergedImages }),
+              })
+                .then((r) => r.json())
+                .then((syncData) => {
+                  if (syncData.listing_data) setListingData(syncData.listing_data);
                 })
-                  .then((r) => r.json())
-                  .then((syncData) => {
-                    if (syncData.listing_data) setListingData(syncData.listing_data);
-                  })
-                  .catch((err) => console.error("Failed to sync images to disk:", err));
-              }
-
-              const errorMsg =
-                statusData.errors && statusData.errors.length > 0
-                  ? `Image generation completed with errors: ${statusData.errors.join("; ")}`
-                  : "Image generation failed";
-              setError(errorMsg);
-
-              setImageGenProgress({
-                isActive: false,
-                taskId: null,
-                total: totalImages,
-                completed: statusData.completed || 0,
-                currentGenerating: [],
-              });
+                .catch((err) => console.error("Failed to sync images to disk:", err));
             }
 
-            setIsConfirming(false);
+            setImageGenProgress({
+              isActive: false,
+              taskId: null,
+              total: totalImages,
+              completed: totalImages,
+              currentGenerating: [],
+            });
           } else {
-            // Update progress
-            setImageGenProgress((prev) => ({
-              ...prev,
+            // Failed - show errors but return partial results if any
+            const aiGeneratedList = statusData.generated_images || [];
+            const partialImages = mergeGeneratedImages(photosToProcess, aiGeneratedList, {
+              allowPartial: true,
+            });
+            setGeneratedImages(partialImages);
+
+            // Sync partial images to disk too
+            if (currentSku && partialImages.length > 0) {
+              fetch("/api/update-listing-images", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ sku: currentSku, image_urls: partialImages }),
+              })
+                .then((r) => r.json())
+                .then((syncData) => {
+                  if (syncData.listing_data) setListingData(syncData.listing_data);
+                })
+                .catch((err) => console.error("Failed to sync images to disk:", err));
+            }
+
+            const errorMsg =
+              statusData.errors && statusData.errors.length > 0
+                ? `Image generation completed with errors: ${statusData.errors.join("; ")}`
+                : "Image generation failed";
+            setError(errorMsg);
+
+            setImageGenProgress({
+              isActive: false,
+              taskId: null,
+              total: totalImages,
               completed: statusData.completed || 0,
-            }));
+              currentGenerating: [],
+            });
           }
-        } catch (pollErr) {
-          console.error("Error polling status:", pollErr);
-          clearInterval(pollInterval);
-          setError("Error checking generation status");
+
           setIsConfirming(false);
-          setImageGenProgress({
-            isActive: false,
-            taskId: null,
-            total: totalImages,
-            completed: 0,
-            currentGenerating: [],
-          });
+          return true;
         }
-      }, 500); // Poll every 500ms
+        // Update progress
+        setImageGenProgress((prev) => ({
+          ...prev,
+          completed: statusData.completed || 0,
+        }));
+        return false;
+      };
+
+      statusSource.onmessage = (event) => {
+        try {
+          handleStatus(JSON.parse(event.data));
+        } catch (statusErr) {
+          handleStatusError(statusErr);
+        }
+      };
+
+      // The server no longer has the task (e.g. it expired); stop instead of reconnecting
+      statusSource.addEventListener("gone", (event) => {
+        let message = "Generation task not found";
+        try {
+          message = JSON.parse(event.data).error || message;
+        } catch (parseErr) {
+          // keep the default message
+        }
+        handleStatusError(new Error(message));
+      });
 
-      // Store interval ID for cleanup if component unmounts
-      // Note: In a real app, you'd use useEffect cleanup, but for now we rely on completion/error handling
+      // If the browser gave up on the stream (e.g. a proxy that doesn't allow
+      // SSE), keep following the task by polling the status endpoint
+      const pollStatus = async () => {
+        try {
+          const statusResponse = await fetch(
+            `/api/generate-images-status/${taskId}`,
+          );
+          const statusData = await statusResponse.json();
+          if (!statusResponse.ok) {
+            throw new Error(statusData.error || `HTTP ${statusResponse.status}`);
+          }
+          if (!handleStatus(statusData)) {
+            setTimeout(pollStatus, 1000);
+          }
+        } catch (statusErr) {
+          handleStatusError(statusErr);
+        }
+      };
+
+      // A dropped connection is retried by EventSource itself (readyState is
+      // CONNECTING); only once it has given up (CLOSED) do we switch to polling
+      statusSource.onerror = () => {
+        if (statusSource.readyState === EventSource.CLOSED) {
+          console.warn("Generation status stream closed; falling back to polling");
+          pollStatus();
+        }
+      };
     } catch (err) {
       console.error("Error generating images:", err);
       setError(err.message || "An error occurred while generating images");